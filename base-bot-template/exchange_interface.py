@@ -6,20 +6,25 @@ from __future__ import annotations
 import random
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable, Dict, List, Protocol
+from typing import Callable, Dict, List, Protocol, Sequence
 
 
 @dataclass
 class MarketSnapshot:
-    """Minimal market view shared with strategies."""
+    """Minimal market view shared with strategies.
+
+    ``prices`` is any read-only float sequence: the live bot passes a list, the
+    backtest runner a NumPy view. Index, slice, ``len()`` and iterate it; don't
+    rely on list methods, ``+`` concatenation or its truthiness.
+    """
 
     symbol: str
-    prices: List[float]
+    prices: Sequence[float]
     current_price: float
     timestamp: datetime
 
     @property
-    def history(self) -> List[float]:
+    def history(self) -> Sequence[float]:
         """Convenience alias used by strategies."""
         return self.prices
 
@@ -6,7 +6,6 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from statistics import mean, pstdev
 from typing import Any, Callable, Deque, Dict, List, Optional
 from collections import deque
 
@@ -40,7 +39,12 @@ class Portfolio:
 
 
 class BaseStrategy(ABC):
-    """Base class every concrete strategy extends."""
+    """Base class every concrete strategy extends.
+
+    Subclasses that do not declare ``__slots__`` still get a ``__dict__``.
+    """
+
+    __slots__ = ("config", "exchange")
 
     def __init__(self, *, config: Dict[str, Any], exchange: Exchange):
         self.config = config
@@ -0,0 +1,16 @@
+"""Put the base bot template on sys.path once per process.
+
+Locally the base template sits next to this one; in the Docker image it is
+copied to /app/base. Importing this module resolves whichever exists; later
+imports hit the module cache and repeat neither the probe nor the insert.
+"""
+
+import os
+import sys
+
+BASE_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'base-bot-template'))
+if not os.path.isdir(BASE_PATH):
+    BASE_PATH = '/app/base'
+
+if BASE_PATH not in sys.path:
+    sys.path.insert(0, BASE_PATH)
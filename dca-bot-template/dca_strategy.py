@@ -9,22 +9,14 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
-from statistics import pstdev
-from typing import Any, Deque, Dict, Optional
+from typing import Any, Deque, Dict, List, Optional
 from collections import deque
 import logging
-
-# Import base infrastructure from base-bot-template
-import sys
+import math
 import os
 
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    # In Docker container, base template is at /app/base/
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+# Import base infrastructure from base-bot-template
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 from strategy_interface import BaseStrategy, Signal, register_strategy
 from exchange_interface import MarketSnapshot
@@ -49,6 +41,13 @@ def _as_bool(val, default: bool = False) -> bool:
     return s in ("1", "true", "yes", "on")
 
 
+def _pstdev(values: List[float]) -> float:
+    """Population standard deviation (float math; statistics.pstdev works in exact fractions)."""
+    n = len(values)
+    avg = math.fsum(values) / n
+    return math.sqrt(math.fsum((v - avg) ** 2 for v in values) / n)
+
+
 # --------------------------------- DCA --------------------------------------
 
 class DcaStrategy(BaseStrategy):
@@ -417,7 +416,7 @@ class AdvancedDcaStrategy(BaseStrategy):
         for prev, curr in zip(window, window[1:]):
             if prev > 0:
                 returns.append((curr - prev) / prev)
-        volatility = pstdev(returns) if len(returns) > 1 else 0.0
+        volatility = _pstdev(returns) if len(returns) > 1 else 0.0
         return self.base_drop_pct * (1 + self.volatility_factor * volatility * 100)
 
     def _price_drop_pct(self, market: MarketSnapshot) -> float:
@@ -4,16 +4,9 @@
 from __future__ import annotations
 
 import sys
-import os
 
 # Import base infrastructure from base-bot-template
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    # In Docker container, base template is at /app/base/
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 # Import DCA strategies
 import dca_strategy  # This registers the DCA strategies
@@ -7,23 +7,24 @@ ETH: Dip Buyer (buy pullbacks with tight trailing stops)
 
 from __future__ import annotations
 
-import sys
-import os
-from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
 from collections import deque
-from statistics import mean
 import logging
 
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 from strategy_interface import BaseStrategy, Signal, Portfolio, register_strategy
 from exchange_interface import MarketSnapshot
+from dip_buyer_core import DipBuyerCore
+
+# Logging is configured once per process and shared by every instance
+_logger = logging.getLogger("AsymmetricStrategy")
+_logger.setLevel(logging.INFO)
+if not _logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(message)s'))
+    _logger.addHandler(_handler)
 
 
 class AsymmetricStrategy(BaseStrategy):
@@ -58,6 +59,10 @@ class AsymmetricStrategy(BaseStrategy):
         self.eth_trailing_stop = float(config.get("eth_trailing_stop_pct", 0.15))  # 15%
         self.eth_cooldown_hours = int(config.get("eth_cooldown_hours", 12))
 
+        # Per-tick constants
+        self._fast_mult = 2 / (self.btc_fast_ema + 1)
+        self._slow_mult = 2 / (self.btc_slow_ema + 1)
+
         # Common parameters
         self.position_pct = float(config.get("position_pct", 0.55))
 
@@ -66,19 +71,38 @@ class AsymmetricStrategy(BaseStrategy):
         self.highest_price_since_entry: Optional[float] = None
         self.current_quantity: float = 0.0
         self.bars_since_last_trade: int = 0
-        self.last_exit_time: Optional[datetime] = None
+        self.last_exit_epoch: Optional[float] = None  # unix seconds
+        self._drawdown: float = 0.0  # from highest_price_since_entry, refreshed each tick in position
 
         # Price history
         self.price_history: deque = deque(maxlen=200)
         self.price_timestamps: deque = deque(maxlen=200)
 
+        # Monotonic (tick, price) window over the breakout period; _breakout_high
+        # is the highest price of the bars preceding the current one
+        self._breakout_deque: Deque[Tuple[int, float]] = deque()
+        self._breakout_high: Optional[float] = None
+
+        # Incremental BTC EMAs, seeded with an SMA once enough prices arrive
+        self._fast_ema: Optional[float] = None
+        self._slow_ema: Optional[float] = None
+        self._ema_warmup_count: int = 0
+        self._ema_warmup_sum: float = 0.0
+
         # Logging
-        self._logger = logging.getLogger(self.__class__.__name__)
-        self._logger.setLevel(logging.INFO)
-        if not self._logger.handlers:
-            handler = logging.StreamHandler()
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(message)s'))
-            self._logger.addHandler(handler)
+        self._logger = _logger
+
+        # ETH entry/exit rules
+        self._eth_dip = DipBuyerCore(
+            dip_threshold=self.eth_dip_threshold,
+            lookback_hours=self.eth_lookback_hours,
+            trailing_stop=self.eth_trailing_stop,
+            cooldown_hours=self.eth_cooldown_hours,
+            position_pct=self.position_pct,
+            history_len=self.price_history.maxlen,
+            logger=self._logger,
+            label="ETH",
+        )
 
     def _detect_asset_type(self, price: float):
         """Detect if this is BTC or ETH based on price."""
@@ -87,100 +111,112 @@ class AsymmetricStrategy(BaseStrategy):
             asset_name = "BTC" if self.is_btc else "ETH"
             self._logger.info(f"🔍 Detected asset: {asset_name} (price: ${price:.2f})")
 
-    def _calculate_ema(self, prices: List[float], period: int) -> Optional[float]:
-        """Calculate EMA."""
-        if len(prices) < period:
-            return None
-        ema = mean(prices[:period])
-        multiplier = 2 / (period + 1)
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
-
-    def _is_breakout(self, prices: List[float], period: int) -> bool:
+    def _next_ema(self, ema: Optional[float], period: int, multiplier: float, price: float) -> Optional[float]:
+        """Advance an EMA by one price, seeding it with the SMA of the first `period` prices."""
+        if ema is not None:
+            return (price * multiplier) + (ema * (1 - multiplier))
+        if self._ema_warmup_count == period:
+            return self._ema_warmup_sum / period
+        return None
+
+    def _update_emas(self, price: float) -> None:
+        """Fold the newest price into the fast and slow EMAs."""
+        if self._fast_ema is None or self._slow_ema is None:
+            self._ema_warmup_count += 1
+            self._ema_warmup_sum += price
+        self._fast_ema = self._next_ema(self._fast_ema, self.btc_fast_ema, self._fast_mult, price)
+        self._slow_ema = self._next_ema(self._slow_ema, self.btc_slow_ema, self._slow_mult, price)
+
+    def _rebuild_emas(self) -> None:
+        """Recompute the EMAs from the stored price history."""
+        self._fast_ema = None
+        self._slow_ema = None
+        self._ema_warmup_count = 0
+        self._ema_warmup_sum = 0.0
+        for price in self.price_history:
+            self._update_emas(price)
+
+    def _is_breakout(self, current_price: float) -> bool:
         """Check if current price breaks above recent high."""
-        if len(prices) < period + 1:
+        if self._breakout_high is None:
             return False
-        current = prices[-1]
-        previous_high = max(prices[-(period+1):-1])
-        return current > previous_high * 1.005
-
-    def _get_recent_high(self, hours: int, current_time: datetime) -> Optional[float]:
-        """Get highest price in last N hours."""
-        if not self.price_timestamps or not self.price_history:
-            return None
-
-        cutoff_time = current_time - timedelta(hours=hours)
-        recent_prices = []
-
+        return current_price > self._breakout_high * 1.005
+
+    def _track_price_highs(self, price: float, timestamp: datetime) -> None:
+        """Push a price onto the ETH lookback window and the BTC breakout window."""
+        tick = self._eth_dip.track(price, timestamp)
+
+        # Capture the high of the previous bars before the current price joins them
+        breakout_deque = self._breakout_deque
+        while breakout_deque and breakout_deque[0][0] < tick - self.btc_breakout_period:
+            breakout_deque.popleft()
+        self._breakout_high = breakout_deque[0][1] if tick > self.btc_breakout_period else None
+        while breakout_deque and breakout_deque[-1][1] <= price:
+            breakout_deque.pop()
+        breakout_deque.append((tick, price))
+
+    def _rebuild_price_highs(self) -> None:
+        """Recreate the rolling-high windows from the stored price history."""
+        self._eth_dip.reset()
+        self._breakout_deque = deque()
+        self._breakout_high = None
         for price, timestamp in zip(self.price_history, self.price_timestamps):
-            if timestamp >= cutoff_time:
-                recent_prices.append(price)
-
-        return max(recent_prices) if recent_prices else None
+            self._track_price_highs(price, timestamp)
 
     # === BTC STRATEGY (TREND RIDER) ===
-    def _btc_strategy(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
+    def _btc_strategy(self, current_price: float, qty: float, cash: float, portfolio_value: float) -> Signal:
         """BTC: Breakout and hold with wide stops."""
-        current_price = market.current_price
-        prices = list(self.price_history)
-
         # Check exits first
-        if portfolio.quantity > 0 and self.entry_price:
+        if qty > 0 and self.entry_price:
             pnl_pct = (current_price - self.entry_price) / self.entry_price
 
-            # Calculate EMAs for trend reversal check
-            slow_ema = self._calculate_ema(prices, self.btc_slow_ema)
+            # Evaluate every exit up front so hold ticks take a single branch
+            slow_ema = self._slow_ema
+            trend_reversal = slow_ema is not None and current_price < slow_ema
+            hard_stop = pnl_pct <= -self.btc_stop_loss
+            trailing_stop = pnl_pct > 0 and self._drawdown >= self.btc_trailing_stop
+
+            if not (trend_reversal or hard_stop or trailing_stop):
+                return Signal("hold", reason=f"BTC riding: {pnl_pct*100:+.1f}%")
 
             # Exit 1: Trend reversal (below slow EMA)
-            if slow_ema and current_price < slow_ema:
+            if trend_reversal:
                 self._logger.info(f"BTC TREND REVERSAL: {pnl_pct*100:+.1f}%")
-                return Signal("sell", size=portfolio.quantity,
-                            reason=f"Trend reversal at {pnl_pct*100:+.1f}%",
-                            entry_price=self.entry_price)
-
+                reason = f"Trend reversal at {pnl_pct*100:+.1f}%"
             # Exit 2: Hard stop loss
-            if pnl_pct <= -self.btc_stop_loss:
+            elif hard_stop:
                 self._logger.info(f"BTC STOP LOSS: {pnl_pct*100:.1f}%")
-                return Signal("sell", size=portfolio.quantity,
-                            reason=f"Stop loss at {pnl_pct*100:.1f}%",
-                            entry_price=self.entry_price)
-
+                reason = f"Stop loss at {pnl_pct*100:.1f}%"
             # Exit 3: Trailing stop
-            if self.highest_price_since_entry:
-                drawdown = (self.highest_price_since_entry - current_price) / self.highest_price_since_entry
-                if drawdown >= self.btc_trailing_stop and pnl_pct > 0:
-                    self._logger.info(f"BTC TRAILING STOP: {pnl_pct*100:+.1f}%")
-                    return Signal("sell", size=portfolio.quantity,
-                                reason=f"Trailing stop at +{pnl_pct*100:.1f}%",
-                                entry_price=self.entry_price)
+            else:
+                self._logger.info(f"BTC TRAILING STOP: {pnl_pct*100:+.1f}%")
+                reason = f"Trailing stop at +{pnl_pct*100:.1f}%"
 
-            return Signal("hold", reason=f"BTC riding: {pnl_pct*100:+.1f}%")
+            return Signal("sell", size=qty, reason=reason, entry_price=self.entry_price)
 
         # Check entries
-        if portfolio.quantity > 0:
+        if qty > 0:
             return Signal("hold", reason="BTC position held")
 
         if self.bars_since_last_trade < self.btc_min_bars_between:
             return Signal("hold", reason=f"BTC cooldown: {self.bars_since_last_trade}/{self.btc_min_bars_between}")
 
-        if len(prices) < self.btc_slow_ema:
+        if len(self.price_history) < self.btc_slow_ema:
             return Signal("hold", reason="BTC insufficient data")
 
         # Entry conditions
-        fast_ema = self._calculate_ema(prices, self.btc_fast_ema)
-        slow_ema = self._calculate_ema(prices, self.btc_slow_ema)
+        fast_ema = self._fast_ema
+        slow_ema = self._slow_ema
 
         if not fast_ema or not slow_ema:
             return Signal("hold", reason="BTC EMAs pending")
 
-        is_breakout = self._is_breakout(prices, self.btc_breakout_period)
+        is_breakout = self._is_breakout(current_price)
         price_above_slow = current_price > slow_ema * 1.02
         ema_bullish = fast_ema > slow_ema
 
         if is_breakout and price_above_slow and ema_bullish:
-            position_value = portfolio.value(current_price) * self.position_pct
-            position_value = min(position_value, portfolio.cash)
+            position_value = min(portfolio_value * self.position_pct, cash)
             size = position_value / current_price
 
             if size > 0:
@@ -190,60 +226,19 @@ class AsymmetricStrategy(BaseStrategy):
         return Signal("hold", reason="BTC waiting for setup")
 
     # === ETH STRATEGY (DIP BUYER) ===
-    def _eth_strategy(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
+    def _eth_strategy(self, current_price: float, current_time: datetime, qty: float, cash: float,
+                      portfolio_value: float) -> Signal:
         """ETH: Buy 2% dips from 3-day high with 15% trailing stop."""
-        current_price = market.current_price
-        current_time = market.timestamp or datetime.now(timezone.utc)
-
-        # Check exits first
-        if portfolio.quantity > 0 and self.entry_price:
-            pnl_pct = (current_price - self.entry_price) / self.entry_price
-
-            # Trailing stop (15%)
-            if self.highest_price_since_entry:
-                drawdown = (self.highest_price_since_entry - current_price) / self.highest_price_since_entry
-                if drawdown >= self.eth_trailing_stop:
-                    self._logger.info(f"ETH TRAILING STOP: {pnl_pct*100:+.1f}%")
-                    return Signal("sell", size=portfolio.quantity,
-                                reason=f"ETH trailing stop at {pnl_pct*100:+.1f}%",
-                                entry_price=self.entry_price)
-
-            return Signal("hold", reason=f"ETH holding: {pnl_pct*100:+.1f}%")
-
-        # Check entries
-        if portfolio.quantity > 0:
-            return Signal("hold", reason="ETH position held")
-
-        # Cooldown check
-        if self.last_exit_time:
-            hours_since_exit = (current_time - self.last_exit_time).total_seconds() / 3600
-            if hours_since_exit < self.eth_cooldown_hours:
-                return Signal("hold", reason=f"ETH cooldown: {hours_since_exit:.1f}/{self.eth_cooldown_hours}h")
-
-        # Get 3-day high
-        recent_high = self._get_recent_high(self.eth_lookback_hours, current_time)
-        if not recent_high:
-            return Signal("hold", reason="ETH insufficient history")
-
-        # Check for dip
-        dip_pct = (recent_high - current_price) / recent_high
-
-        if dip_pct >= self.eth_dip_threshold:
-            position_value = portfolio.value(current_price) * self.position_pct
-            position_value = min(position_value, portfolio.cash)
-            size = position_value / current_price
-
-            if size > 0:
-                self._logger.info(f"🎯 ETH BUY: {dip_pct*100:.1f}% dip @ ${current_price:.2f}")
-                self._logger.info(f"   3-day high: ${recent_high:.2f}")
-                return Signal("buy", size=size, reason=f"ETH dip buy: {dip_pct*100:.1f}%")
-
-        return Signal("hold", reason=f"ETH waiting for dip (current: {dip_pct*100:.1f}%)")
+        return self._eth_dip.generate_signal(current_price, current_time, qty, cash, portfolio_value,
+                                             self.entry_price, self._drawdown, self.last_exit_epoch)
 
     def generate_signal(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
         """Route to appropriate strategy based on asset type."""
         current_price = market.current_price
-        current_time = market.timestamp or datetime.now(timezone.utc)
+        current_time = market.timestamp if market.timestamp is not None else datetime.now(timezone.utc)
+        qty = portfolio.quantity
+        cash = portfolio.cash
+        portfolio_value = portfolio.value(current_price)
 
         # Detect asset type
         self._detect_asset_type(current_price)
@@ -251,19 +246,21 @@ class AsymmetricStrategy(BaseStrategy):
         # Update price history
         self.price_history.append(current_price)
         self.price_timestamps.append(current_time)
+        self._track_price_highs(current_price, current_time)
+        self._update_emas(current_price)
         self.bars_since_last_trade += 1
 
-        # Track highest price
-        if portfolio.quantity > 0:
-            if self.highest_price_since_entry is None or current_price > self.highest_price_since_entry:
-                self.highest_price_since_entry = current_price
-            self.current_quantity = portfolio.quantity
+        # Track highest price and the drawdown from it
+        if qty > 0:
+            self.highest_price_since_entry, self._drawdown = DipBuyerCore.track_peak(
+                current_price, self.highest_price_since_entry)
+            self.current_quantity = qty
 
         # Route to appropriate strategy
         if self.is_btc:
-            return self._btc_strategy(market, portfolio)
+            return self._btc_strategy(current_price, qty, cash, portfolio_value)
         else:
-            return self._eth_strategy(market, portfolio)
+            return self._eth_strategy(current_price, current_time, qty, cash, portfolio_value)
 
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Track trades and update state."""
@@ -288,7 +285,7 @@ class AsymmetricStrategy(BaseStrategy):
                 self.entry_price = None
                 self.highest_price_since_entry = None
                 self.current_quantity = 0.0
-                self.last_exit_time = timestamp
+                self.last_exit_epoch = timestamp.timestamp() if timestamp else None
             self.bars_since_last_trade = 0
 
     def get_state(self) -> Dict[str, Any]:
@@ -299,7 +296,12 @@ class AsymmetricStrategy(BaseStrategy):
             "highest_price_since_entry": self.highest_price_since_entry,
             "current_quantity": self.current_quantity,
             "bars_since_last_trade": self.bars_since_last_trade,
-            "last_exit_time": self.last_exit_time.isoformat() if self.last_exit_time else None,
+            "fast_ema": self._fast_ema,
+            "slow_ema": self._slow_ema,
+            "ema_warmup_count": self._ema_warmup_count,
+            "ema_warmup_sum": self._ema_warmup_sum,
+            "last_exit_time": (datetime.fromtimestamp(self.last_exit_epoch, timezone.utc).isoformat()
+                               if self.last_exit_epoch is not None else None),
             "price_history": list(self.price_history),
             "price_timestamps": [ts.isoformat() for ts in self.price_timestamps]
         }
@@ -313,17 +315,28 @@ class AsymmetricStrategy(BaseStrategy):
         self.bars_since_last_trade = state.get("bars_since_last_trade", 0)
 
         if state.get("last_exit_time"):
-            self.last_exit_time = datetime.fromisoformat(state["last_exit_time"])
+            self.last_exit_epoch = datetime.fromisoformat(state["last_exit_time"]).timestamp()
 
         if "price_history" in state:
             self.price_history = deque(state["price_history"], maxlen=200)
 
         if "price_timestamps" in state:
+            # Only the newest 200 entries survive the deque, so skip parsing the rest
             self.price_timestamps = deque(
-                [datetime.fromisoformat(ts) for ts in state["price_timestamps"]],
+                map(datetime.fromisoformat, state["price_timestamps"][-200:]),
                 maxlen=200
             )
 
+        self._rebuild_price_highs()
+
+        if "ema_warmup_count" in state:
+            self._fast_ema = state.get("fast_ema")
+            self._slow_ema = state.get("slow_ema")
+            self._ema_warmup_count = state["ema_warmup_count"]
+            self._ema_warmup_sum = state.get("ema_warmup_sum", 0.0)
+        else:
+            self._rebuild_emas()
+
 
 # Register this strategy
 register_strategy("asymmetric", AsymmetricStrategy)
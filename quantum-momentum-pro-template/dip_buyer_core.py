@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Dip-buying rules shared by EthDipBuyer and the ETH leg of AsymmetricStrategy."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Deque, Optional, Tuple
+from collections import deque
+import logging
+
+from strategy_interface import Signal
+
+
+class DipBuyerCore:
+    """Buy dips from a rolling high, exit with a trailing stop from the peak.
+
+    The owning strategy keeps the position state and price history; the core
+    keeps the rolling-high window and turns both into signals.
+    """
+
+    def __init__(self, *, dip_threshold: float, lookback_hours: int, trailing_stop: float,
+                 cooldown_hours: int, position_pct: float, history_len: int,
+                 logger: logging.Logger, label: str = ""):
+        self.dip_threshold = dip_threshold
+        self.lookback_hours = lookback_hours
+        self.trailing_stop = trailing_stop
+        self.cooldown_hours = cooldown_hours
+        self.position_pct = position_pct
+        self.history_len = history_len
+        self.label = label
+
+        self._lookback_td = timedelta(hours=lookback_hours)
+        self._cooldown_seconds = cooldown_hours * 3600
+        self._prefix = f"{label} " if label else ""
+        self._logger = logger
+
+        # Monotonic (tick, timestamp, price) window backing recent_high
+        self.tick: int = 0
+        self._hi_deque: Deque[Tuple[int, datetime, float]] = deque()
+
+    def _reason(self, text: str) -> str:
+        """Prefix a signal reason with the asset label, if any."""
+        return f"{self.label} {text}" if self.label else text[0].upper() + text[1:]
+
+    def reset(self) -> None:
+        """Forget all tracked prices."""
+        self.tick = 0
+        self._hi_deque = deque()
+
+    def track(self, price: float, timestamp: datetime) -> int:
+        """Push a price onto the rolling-high window and return its tick index."""
+        self.tick += 1
+        hi_deque = self._hi_deque
+        while hi_deque and hi_deque[-1][2] <= price:
+            hi_deque.pop()
+        hi_deque.append((self.tick, timestamp, price))
+        return self.tick
+
+    def recent_high(self, current_time: datetime) -> Optional[float]:
+        """Get highest price within the lookback window (bounded by the price history length)."""
+        hi_deque = self._hi_deque
+        cutoff_time = current_time - self._lookback_td
+        oldest_tick = self.tick - self.history_len
+
+        while hi_deque and (hi_deque[0][0] <= oldest_tick or hi_deque[0][1] < cutoff_time):
+            hi_deque.popleft()
+
+        return hi_deque[0][2] if hi_deque else None
+
+    @staticmethod
+    def track_peak(price: float, highest: Optional[float]) -> Tuple[float, float]:
+        """Raise the peak since entry to `price` if it is higher.
+
+        Returns the new peak and the fractional drawdown of `price` from it, which is
+        what generate_signal expects as `drawdown`.
+        """
+        if highest is None or price > highest:
+            highest = price
+        return highest, (highest - price) / highest if highest else 0.0
+
+    def generate_signal(self, current_price: float, current_time: datetime, qty: float, cash: float,
+                        portfolio_value: float, entry_price: Optional[float], drawdown: float,
+                        last_exit_epoch: Optional[float]) -> Signal:
+        """Generate a dip-buying signal for the owning strategy's position.
+
+        `portfolio_value` is the owning strategy's portfolio value at this tick,
+        `drawdown` the fractional drop from the highest price since entry and
+        `last_exit_epoch` the unix time of the last full exit.
+        """
+        prefix = self._prefix
+
+        # Check exits first
+        if qty > 0 and entry_price:
+            pnl_pct = (current_price - entry_price) / entry_price
+
+            # Trailing stop
+            if drawdown >= self.trailing_stop:
+                self._logger.info(f"{prefix}TRAILING STOP: {pnl_pct*100:+.1f}%")
+                return Signal("sell", size=qty,
+                            reason=self._reason(f"trailing stop at {pnl_pct*100:+.1f}%"),
+                            entry_price=entry_price)
+
+            return Signal("hold", reason=self._reason(f"holding: {pnl_pct*100:+.1f}%"))
+
+        # Check entries
+        if qty > 0:
+            return Signal("hold", reason=self._reason("position held"))
+
+        # Cooldown check
+        if last_exit_epoch is not None:
+            seconds_since_exit = current_time.timestamp() - last_exit_epoch
+            if seconds_since_exit < self._cooldown_seconds:
+                hours_since_exit = seconds_since_exit / 3600
+                return Signal("hold", reason=self._reason(f"cooldown: {hours_since_exit:.1f}/{self.cooldown_hours}h"))
+
+        # Get lookback high
+        recent_high = self.recent_high(current_time)
+        if not recent_high:
+            return Signal("hold", reason=self._reason("insufficient history"))
+
+        # Check for dip
+        dip_pct = (recent_high - current_price) / recent_high
+
+        if dip_pct >= self.dip_threshold:
+            position_value = min(portfolio_value * self.position_pct, cash)
+            size = position_value / current_price
+
+            if size > 0:
+                self._logger.info(f"🎯 {prefix}BUY: {dip_pct*100:.1f}% dip @ ${current_price:.2f}")
+                self._logger.info(f"   3-day high: ${recent_high:.2f}")
+                return Signal("buy", size=size, reason=self._reason(f"dip buy: {dip_pct*100:.1f}%"))
+
+        return Signal("hold", reason=self._reason(f"waiting for dip (current: {dip_pct*100:.1f}%)"))
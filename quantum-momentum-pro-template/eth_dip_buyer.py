@@ -3,22 +3,24 @@
 
 from __future__ import annotations
 
-import sys
-import os
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from collections import deque
 import logging
 
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 from strategy_interface import BaseStrategy, Signal, Portfolio, register_strategy
 from exchange_interface import MarketSnapshot
+from dip_buyer_core import DipBuyerCore
+
+# Logging is configured once per process and shared by every instance
+_logger = logging.getLogger("EthDipBuyer")
+_logger.setLevel(logging.INFO)
+if not _logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(message)s'))
+    _logger.addHandler(_handler)
 
 
 class EthDipBuyer(BaseStrategy):
@@ -43,93 +45,47 @@ class EthDipBuyer(BaseStrategy):
         self.entry_price: Optional[float] = None
         self.highest_price_since_entry: Optional[float] = None
         self.current_quantity: float = 0.0
-        self.last_exit_time: Optional[datetime] = None
+        self.last_exit_epoch: Optional[float] = None  # unix seconds
+        self._drawdown: float = 0.0  # from highest_price_since_entry, refreshed each tick in position
 
         # Price history
         self.price_history: deque = deque(maxlen=200)
         self.price_timestamps: deque = deque(maxlen=200)
 
         # Logging
-        self._logger = logging.getLogger(self.__class__.__name__)
-        self._logger.setLevel(logging.INFO)
-        if not self._logger.handlers:
-            handler = logging.StreamHandler()
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(message)s'))
-            self._logger.addHandler(handler)
-
-    def _get_recent_high(self, hours: int, current_time: datetime) -> Optional[float]:
-        """Get highest price in last N hours."""
-        if not self.price_timestamps or not self.price_history:
-            return None
-
-        cutoff_time = current_time - timedelta(hours=hours)
-        recent_prices = []
-
-        for price, timestamp in zip(self.price_history, self.price_timestamps):
-            if timestamp >= cutoff_time:
-                recent_prices.append(price)
-
-        return max(recent_prices) if recent_prices else None
+        self._logger = _logger
+
+        # Entry/exit rules
+        self._dip = DipBuyerCore(
+            dip_threshold=self.dip_threshold,
+            lookback_hours=self.lookback_hours,
+            trailing_stop=self.trailing_stop,
+            cooldown_hours=self.cooldown_hours,
+            position_pct=self.position_pct,
+            history_len=self.price_history.maxlen,
+            logger=self._logger,
+        )
 
     def generate_signal(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
         """Generate dip-buying signal."""
         current_price = market.current_price
-        current_time = market.timestamp or datetime.now(timezone.utc)
+        current_time = market.timestamp if market.timestamp is not None else datetime.now(timezone.utc)
+        qty = portfolio.quantity
 
         # Update history
         self.price_history.append(current_price)
         self.price_timestamps.append(current_time)
+        self._dip.track(current_price, current_time)
+
+        # Track highest price and the drawdown from it if holding
+        if qty > 0:
+            self.highest_price_since_entry, self._drawdown = DipBuyerCore.track_peak(
+                current_price, self.highest_price_since_entry)
+            self.current_quantity = qty
 
-        # Track highest price if holding
-        if portfolio.quantity > 0:
-            if self.highest_price_since_entry is None or current_price > self.highest_price_since_entry:
-                self.highest_price_since_entry = current_price
-            self.current_quantity = portfolio.quantity
-
-        # === EXIT LOGIC ===
-        if portfolio.quantity > 0 and self.entry_price:
-            pnl_pct = (current_price - self.entry_price) / self.entry_price
-
-            # Trailing stop (15%)
-            if self.highest_price_since_entry:
-                drawdown = (self.highest_price_since_entry - current_price) / self.highest_price_since_entry
-                if drawdown >= self.trailing_stop:
-                    self._logger.info(f"TRAILING STOP: {pnl_pct*100:+.1f}%")
-                    return Signal("sell", size=portfolio.quantity,
-                                reason=f"Trailing stop at {pnl_pct*100:+.1f}%",
-                                entry_price=self.entry_price)
-
-            return Signal("hold", reason=f"Holding: {pnl_pct*100:+.1f}%")
-
-        # === ENTRY LOGIC ===
-        if portfolio.quantity > 0:
-            return Signal("hold", reason="Position held")
-
-        # Cooldown check
-        if self.last_exit_time:
-            hours_since_exit = (current_time - self.last_exit_time).total_seconds() / 3600
-            if hours_since_exit < self.cooldown_hours:
-                return Signal("hold", reason=f"Cooldown: {hours_since_exit:.1f}/{self.cooldown_hours}h")
-
-        # Get 3-day high
-        recent_high = self._get_recent_high(self.lookback_hours, current_time)
-        if not recent_high:
-            return Signal("hold", reason="Insufficient history")
-
-        # Check for dip
-        dip_pct = (recent_high - current_price) / recent_high
-
-        if dip_pct >= self.dip_threshold:
-            position_value = portfolio.value(current_price) * self.position_pct
-            position_value = min(position_value, portfolio.cash)
-            size = position_value / current_price
-
-            if size > 0:
-                self._logger.info(f"🎯 BUY: {dip_pct*100:.1f}% dip @ ${current_price:.2f}")
-                self._logger.info(f"   3-day high: ${recent_high:.2f}")
-                return Signal("buy", size=size, reason=f"Dip buy: {dip_pct*100:.1f}%")
-
-        return Signal("hold", reason=f"Waiting for dip (current: {dip_pct*100:.1f}%)")
+        return self._dip.generate_signal(current_price, current_time, qty, portfolio.cash,
+                                         portfolio.value(current_price), self.entry_price,
+                                         self._drawdown, self.last_exit_epoch)
 
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Track trades."""
@@ -151,7 +107,7 @@ class EthDipBuyer(BaseStrategy):
                 self.entry_price = None
                 self.highest_price_since_entry = None
                 self.current_quantity = 0.0
-                self.last_exit_time = timestamp
+                self.last_exit_epoch = timestamp.timestamp() if timestamp else None
 
     def get_state(self) -> Dict[str, Any]:
         """Return state."""
@@ -159,7 +115,8 @@ class EthDipBuyer(BaseStrategy):
             "entry_price": self.entry_price,
             "highest_price_since_entry": self.highest_price_since_entry,
             "current_quantity": self.current_quantity,
-            "last_exit_time": self.last_exit_time.isoformat() if self.last_exit_time else None,
+            "last_exit_time": (datetime.fromtimestamp(self.last_exit_epoch, timezone.utc).isoformat()
+                               if self.last_exit_epoch is not None else None),
             "price_history": list(self.price_history),
             "price_timestamps": [ts.isoformat() for ts in self.price_timestamps]
         }
@@ -171,17 +128,22 @@ class EthDipBuyer(BaseStrategy):
         self.current_quantity = state.get("current_quantity", 0.0)
 
         if state.get("last_exit_time"):
-            self.last_exit_time = datetime.fromisoformat(state["last_exit_time"])
+            self.last_exit_epoch = datetime.fromisoformat(state["last_exit_time"]).timestamp()
 
         if "price_history" in state:
             self.price_history = deque(state["price_history"], maxlen=200)
 
         if "price_timestamps" in state:
+            # Only the newest 200 entries survive the deque, so skip parsing the rest
             self.price_timestamps = deque(
-                [datetime.fromisoformat(ts) for ts in state["price_timestamps"]],
+                map(datetime.fromisoformat, state["price_timestamps"][-200:]),
                 maxlen=200
             )
 
+        self._dip.reset()
+        for price, timestamp in zip(self.price_history, self.price_timestamps):
+            self._dip.track(price, timestamp)
+
 
 # Register strategy
 register_strategy("eth_dip_buyer", EthDipBuyer)
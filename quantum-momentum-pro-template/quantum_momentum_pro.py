@@ -12,20 +12,14 @@ This strategy combines multiple technical indicators for high-probability entrie
 
 from __future__ import annotations
 
-import sys
-import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Deque
-from collections import deque
-from statistics import mean, pstdev
+from typing import Any, DefaultDict, Dict, List, Optional, Deque
+from collections import defaultdict, deque
+from itertools import islice
 import logging
+import math
 
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 from strategy_interface import BaseStrategy, Signal, Portfolio, register_strategy
 from exchange_interface import MarketSnapshot
@@ -92,7 +86,7 @@ class QuantumMomentumProStrategy(BaseStrategy):
 
         # Trade frequency control - use trade count instead of timestamp
         self.max_trades_per_month = int(config.get("max_trades_per_month", 3))  # Max 3 trades per month per symbol
-        self.trade_count_by_month: Dict[str, int] = {}  # Track trades by month
+        self.trade_count_by_month: DefaultDict[int, int] = defaultdict(int)  # Track trades by year * 12 + month
 
         # State tracking
         self.positions: Deque[Dict[str, Any]] = deque()
@@ -100,55 +94,126 @@ class QuantumMomentumProStrategy(BaseStrategy):
         self.highest_price_since_entry: Optional[float] = None
         self.starting_portfolio_value: Optional[float] = None
         self.current_quantity: float = 0.0  # Track our position size
-        self.last_trade_time: Optional[datetime] = None  # Track last trade timestamp
+        self.last_trade_time: Optional[float] = None  # Last trade timestamp (unix seconds)
 
         # Price history for indicators
         self.price_history: Deque[float] = deque(maxlen=max(self.ema_slow, self.bb_period, self.atr_period) + 50)
 
-        # Logging
-        self._logger = logging.getLogger("strategy.quantum_momentum_pro")
-
-    def prepare(self) -> None:
-        """Warm-up phase - collect initial price data."""
-        self._logger.info("Quantum Momentum Pro Strategy initialized and ready")
+        # Incremental EMA state per period, each seeded with the SMA of its first `period` prices
+        self._ema_periods: List[int] = sorted({self.ema_fast, self.ema_medium, self.ema_slow,
+                                               self.macd_fast, self.macd_slow})
+        self._ema_state: Dict[int, float] = {}
+        self._ema_seed_sum: float = 0.0
+        self._ema_seed_count: int = 0
 
-    # ==================== INDICATOR CALCULATIONS ====================
+        # EMA smoothing constants per period (the MACD signal line included)
+        self._ema_alpha: Dict[int, float] = {period: 2 / (period + 1)
+                                             for period in (*self._ema_periods, self.macd_signal)}
+        self._ema_beta: Dict[int, float] = {period: 1 - alpha for period, alpha in self._ema_alpha.items()}
 
-    def _calculate_ema(self, prices: List[float], period: int) -> Optional[float]:
-        """Calculate Exponential Moving Average."""
-        if len(prices) < period:
-            return None
+        # MACD signal line: EMA of the MACD line, seeded with the SMA of its first macd_signal values
+        self._macd_signal_ema: Optional[float] = None
+        self._macd_seed_sum: float = 0.0
+        self._macd_seed_count: int = 0
 
-        multiplier = 2 / (period + 1)
-        ema = mean(prices[:period])  # Start with SMA
+        # Wilder-smoothed RSI state; the averages hold plain sums until rsi_period changes are seen
+        self._rsi_avg_gain: float = 0.0
+        self._rsi_avg_loss: float = 0.0
+        self._rsi_count: int = 0
 
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
+        # Rolling sum and sum of squares over the last bb_period prices
+        self._bb_sum: float = 0.0
+        self._bb_sumsq: float = 0.0
 
-        return ema
+        # Rolling window of absolute price changes backing ATR
+        self._true_ranges: Deque[float] = deque(maxlen=self.atr_period)
+        self._true_range_sum: float = 0.0
 
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> Optional[float]:
-        """Calculate Relative Strength Index."""
-        if len(prices) < period + 1:
-            return None
+        # Logging
+        self._logger = logging.getLogger("strategy.quantum_momentum_pro")
 
-        gains = []
-        losses = []
+    def prepare(self) -> None:
+        """Warm-up phase - collect initial price data."""
+        self._logger.info("Quantum Momentum Pro Strategy initialized and ready")
 
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
+    # ==================== INDICATOR CALCULATIONS ====================
 
-        if len(gains) < period:
+    def _update_indicators(self, price: float, prev_price: Optional[float]) -> None:
+        """Fold the newest price into every incremental indicator in a single step."""
+        self._update_emas(price)
+        self._update_macd_signal()
+        self._update_bands(price)
+        if prev_price is not None:
+            change = price - prev_price
+            self._update_rsi(change)
+            self._update_atr(abs(change))
+
+    def _update_emas(self, price: float) -> None:
+        """Fold the newest price into every tracked EMA."""
+        state = self._ema_state
+        if len(state) < len(self._ema_periods):
+            self._ema_seed_count += 1
+            self._ema_seed_sum += price
+
+        alpha = self._ema_alpha
+        beta = self._ema_beta
+        for period in self._ema_periods:
+            ema = state.get(period)
+            if ema is not None:
+                state[period] = (price * alpha[period]) + (ema * beta[period])
+            elif self._ema_seed_count == period:
+                state[period] = self._ema_seed_sum / period  # Start with SMA
+
+    def _rebuild_emas(self) -> None:
+        """Recompute every tracked EMA and the MACD signal line from the stored price history."""
+        self._ema_state = {}
+        self._ema_seed_sum = 0.0
+        self._ema_seed_count = 0
+        self._macd_signal_ema = None
+        self._macd_seed_sum = 0.0
+        self._macd_seed_count = 0
+        for price in self.price_history:
+            self._update_emas(price)
+            self._update_macd_signal()
+
+    def _get_ema(self, period: int) -> Optional[float]:
+        """Current Exponential Moving Average for a tracked period (None while warming up)."""
+        return self._ema_state.get(period)
+
+    def _update_rsi(self, change: float) -> None:
+        """Fold the newest price change into the Wilder-smoothed RSI averages."""
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        period = self.rsi_period
+        self._rsi_count += 1
+        if self._rsi_count <= period:
+            self._rsi_avg_gain += gain
+            self._rsi_avg_loss += loss
+            if self._rsi_count == period:
+                # Seed with the simple average of the first `period` changes
+                self._rsi_avg_gain /= period
+                self._rsi_avg_loss /= period
+        else:
+            self._rsi_avg_gain = (self._rsi_avg_gain * (period - 1) + gain) / period
+            self._rsi_avg_loss = (self._rsi_avg_loss * (period - 1) + loss) / period
+
+    def _rebuild_rsi(self) -> None:
+        """Recompute the RSI averages from the stored price history."""
+        self._rsi_avg_gain = 0.0
+        self._rsi_avg_loss = 0.0
+        self._rsi_count = 0
+        prices = self.price_history
+        for prev_price, price in zip(prices, islice(prices, 1, None)):
+            self._update_rsi(price - prev_price)
+
+    def _calculate_rsi(self) -> Optional[float]:
+        """Calculate Relative Strength Index (Wilder's smoothing)."""
+        if self._rsi_count < self.rsi_period:
             return None
 
-        avg_gain = mean(gains[-period:])
-        avg_loss = mean(losses[-period:])
+        avg_gain = self._rsi_avg_gain
+        avg_loss = self._rsi_avg_loss
 
         if avg_loss == 0:
             return 100
@@ -158,37 +223,78 @@ class QuantumMomentumProStrategy(BaseStrategy):
 
         return rsi
 
-    def _calculate_macd(self, prices: List[float]) -> Optional[Dict[str, float]]:
-        """Calculate MACD (Moving Average Convergence Divergence)."""
-        if len(prices) < self.macd_slow:
-            return None
-
-        ema_fast = self._calculate_ema(prices, self.macd_fast)
-        ema_slow = self._calculate_ema(prices, self.macd_slow)
+    def _macd_line(self) -> Optional[float]:
+        """Fast minus slow MACD EMA (None while either is warming up)."""
+        ema_fast = self._get_ema(self.macd_fast)
+        ema_slow = self._get_ema(self.macd_slow)
 
         if ema_fast is None or ema_slow is None:
             return None
 
-        macd_line = ema_fast - ema_slow
+        return ema_fast - ema_slow
+
+    def _update_macd_signal(self) -> None:
+        """Fold the current MACD line into the signal-line EMA."""
+        macd_line = self._macd_line()
+        if macd_line is None:
+            return
+
+        signal = self._macd_signal_ema
+        if signal is not None:
+            period = self.macd_signal
+            self._macd_signal_ema = (macd_line * self._ema_alpha[period]) + (signal * self._ema_beta[period])
+        else:
+            self._macd_seed_sum += macd_line
+            self._macd_seed_count += 1
+            if self._macd_seed_count == self.macd_signal:
+                self._macd_signal_ema = self._macd_seed_sum / self.macd_signal  # Start with SMA
+
+    def _calculate_macd(self) -> Optional[Dict[str, float]]:
+        """Calculate MACD (Moving Average Convergence Divergence)."""
+        macd_line = self._macd_line()
+        signal = self._macd_signal_ema
 
-        # For signal line, we need MACD history
-        # Simplified: using current MACD as both line and signal for first calculation
-        # In production, maintain MACD history
+        if macd_line is None or signal is None:
+            return None
 
         return {
             "macd": macd_line,
-            "signal": macd_line * 0.9,  # Simplified
-            "histogram": macd_line * 0.1
+            "signal": signal,
+            "histogram": macd_line - signal
         }
 
-    def _calculate_bollinger_bands(self, prices: List[float]) -> Optional[Dict[str, float]]:
+    def _recent_prices(self, count: int) -> List[float]:
+        """The newest `count` prices from the history, oldest first."""
+        history = self.price_history
+        return list(islice(history, max(len(history) - count, 0), None))
+
+    def _update_bands(self, price: float) -> None:
+        """Slide the Bollinger window sums forward to the newest (already appended) price."""
+        self._bb_sum += price
+        self._bb_sumsq += price * price
+
+        history = self.price_history
+        if len(history) > self.bb_period:
+            # price_history is longer than the band window, so the leaving price is still stored
+            leaving = history[-self.bb_period - 1]
+            self._bb_sum -= leaving
+            self._bb_sumsq -= leaving * leaving
+
+    def _rebuild_bands(self) -> None:
+        """Recompute the Bollinger window sums from the newest stored prices."""
+        recent_prices = self._recent_prices(self.bb_period)
+        self._bb_sum = sum(recent_prices)
+        self._bb_sumsq = sum(price * price for price in recent_prices)
+
+    def _calculate_bollinger_bands(self) -> Optional[Dict[str, float]]:
         """Calculate Bollinger Bands."""
-        if len(prices) < self.bb_period:
+        if len(self.price_history) < self.bb_period:
             return None
 
-        recent_prices = prices[-self.bb_period:]
-        sma = mean(recent_prices)
-        std_dev = pstdev(recent_prices)
+        sma = self._bb_sum / self.bb_period
+        # Population variance; clamp the rounding noise of the running sums at zero
+        variance = max(self._bb_sumsq / self.bb_period - sma * sma, 0.0)
+        std_dev = math.sqrt(variance)
 
         return {
             "upper": sma + (self.bb_std * std_dev),
@@ -196,27 +302,35 @@ class QuantumMomentumProStrategy(BaseStrategy):
             "lower": sma - (self.bb_std * std_dev)
         }
 
-    def _calculate_atr(self, prices: List[float]) -> Optional[float]:
-        """Calculate Average True Range (simplified using price ranges)."""
-        if len(prices) < self.atr_period + 1:
-            return None
-
-        true_ranges = []
+    def _update_atr(self, true_range: float) -> None:
+        """Push the newest true range into the rolling ATR window."""
+        ranges = self._true_ranges
+        if len(ranges) == ranges.maxlen:
+            self._true_range_sum -= ranges[0]
+        ranges.append(true_range)
+        self._true_range_sum += true_range
+
+    def _rebuild_atr(self) -> None:
+        """Refill the ATR window from the newest stored prices."""
+        self._true_ranges.clear()
+        self._true_range_sum = 0.0
+        prices = self._recent_prices(self.atr_period + 1)
         for i in range(1, len(prices)):
-            high_low = abs(prices[i] - prices[i-1])
-            true_ranges.append(high_low)
+            self._update_atr(abs(prices[i] - prices[i-1]))
 
-        if len(true_ranges) < self.atr_period:
+    def _calculate_atr(self) -> Optional[float]:
+        """Calculate Average True Range (simplified using price ranges)."""
+        if len(self._true_ranges) < self.atr_period:
             return None
 
-        atr = mean(true_ranges[-self.atr_period:])
+        atr = self._true_range_sum / self.atr_period
         return atr
 
     # ==================== SIGNAL GENERATION ====================
 
     def _calculate_signal_strength(self, market: MarketSnapshot) -> float:
         """Calculate signal strength from 0.0 to 1.0 based on indicator confluence."""
-        prices = list(self.price_history) + [market.current_price]
+        prices = self.price_history
 
         if len(prices) < self.ema_slow:
             return 0.0
@@ -225,9 +339,9 @@ class QuantumMomentumProStrategy(BaseStrategy):
         max_strength = 6.0  # Number of indicators
 
         # 1. Triple EMA alignment
-        ema_fast = self._calculate_ema(prices, self.ema_fast)
-        ema_medium = self._calculate_ema(prices, self.ema_medium)
-        ema_slow = self._calculate_ema(prices, self.ema_slow)
+        ema_fast = self._get_ema(self.ema_fast)
+        ema_medium = self._get_ema(self.ema_medium)
+        ema_slow = self._get_ema(self.ema_slow)
 
         if ema_fast and ema_medium and ema_slow:
             # Bullish: fast > medium > slow
@@ -237,7 +351,7 @@ class QuantumMomentumProStrategy(BaseStrategy):
                 strength += 0.5
 
         # 2. RSI
-        rsi = self._calculate_rsi(prices, self.rsi_period)
+        rsi = self._calculate_rsi()
         if rsi:
             if rsi < self.rsi_oversold:
                 strength += 1.0  # Strong buy signal
@@ -245,12 +359,12 @@ class QuantumMomentumProStrategy(BaseStrategy):
                 strength += 0.5  # Moderate buy signal
 
         # 3. MACD
-        macd = self._calculate_macd(prices)
+        macd = self._calculate_macd()
         if macd and macd["macd"] > macd["signal"]:
             strength += 1.0
 
         # 4. Bollinger Bands
-        bb = self._calculate_bollinger_bands(prices)
+        bb = self._calculate_bollinger_bands()
         if bb:
             # Price near lower band = buy signal
             if market.current_price <= bb["lower"]:
@@ -267,7 +381,7 @@ class QuantumMomentumProStrategy(BaseStrategy):
                 strength += 0.5
 
         # 6. Volatility (ATR) - lower volatility = higher confidence
-        atr = self._calculate_atr(prices)
+        atr = self._calculate_atr()
         if atr:
             volatility_pct = atr / market.current_price
             if volatility_pct < 0.02:  # Low volatility
@@ -277,28 +391,29 @@ class QuantumMomentumProStrategy(BaseStrategy):
 
         return min(strength / max_strength, 1.0)
 
-    def _should_buy(self, market: MarketSnapshot, portfolio: Portfolio) -> tuple[bool, float, str]:
-        """Determine if we should buy and with what position size."""
-        prices = list(self.price_history) + [market.current_price]
+    def _should_buy(self, market: MarketSnapshot, portfolio: Portfolio,
+                    current_value: float) -> tuple[bool, float, str]:
+        """Determine if we should buy and with what position size.
+
+        The cheap guards run first, so most ticks return before any indicator is read.
+        """
+        # CRITICAL: Don't open new positions if we already have one
+        # This prevents the partial-sell-rebuy loop
+        if portfolio.quantity > 0:
+            return False, 0.0, "Already holding position (no re-entry until fully closed)"
 
         # Need minimum data
-        if len(prices) < self.ema_slow:
+        if len(self.price_history) < self.ema_slow:
             return False, 0.0, "Insufficient data for indicators"
 
         # Trade frequency control (prevent overtrading)
         if market.timestamp:
-            month_key = market.timestamp.strftime("%Y-%m")
+            month_key = market.timestamp.year * 12 + market.timestamp.month
             trades_this_month = self.trade_count_by_month.get(month_key, 0)
             if trades_this_month >= self.max_trades_per_month:
                 return False, 0.0, f"Monthly trade limit reached: {trades_this_month}/{self.max_trades_per_month}"
 
-        # CRITICAL: Don't open new positions if we already have one
-        # This prevents the partial-sell-rebuy loop
-        if portfolio.quantity > 0:
-            return False, 0.0, "Already holding position (no re-entry until fully closed)"
-
         # Don't buy if we have significant holdings
-        current_value = portfolio.value(market.current_price)
         position_value = portfolio.quantity * market.current_price
         position_pct = position_value / current_value if current_value > 0 else 0
 
@@ -312,12 +427,12 @@ class QuantumMomentumProStrategy(BaseStrategy):
                 return False, 0.0, f"Drawdown protection active: {drawdown*100:.2f}%"
 
         # Calculate indicators
-        ema_fast = self._calculate_ema(prices, self.ema_fast)
-        ema_medium = self._calculate_ema(prices, self.ema_medium)
-        ema_slow = self._calculate_ema(prices, self.ema_slow)
-        rsi = self._calculate_rsi(prices, self.rsi_period)
-        macd = self._calculate_macd(prices)
-        bb = self._calculate_bollinger_bands(prices)
+        ema_fast = self._get_ema(self.ema_fast)
+        ema_medium = self._get_ema(self.ema_medium)
+        ema_slow = self._get_ema(self.ema_slow)
+        rsi = self._calculate_rsi()
+        macd = self._calculate_macd()
+        bb = self._calculate_bollinger_bands()
 
         # Core buy conditions
         bullish_trend = ema_fast and ema_medium and ema_fast > ema_medium
@@ -354,13 +469,13 @@ class QuantumMomentumProStrategy(BaseStrategy):
         # Calculate profit/loss
         pnl_pct = (current_price - self.entry_price) / self.entry_price
 
-        # 1. Stop Loss (ATR-based)
-        prices = list(self.price_history) + [current_price]
-        atr = self._calculate_atr(prices)
-        if atr:
-            stop_loss_price = self.entry_price - (atr * self.stop_loss_atr_multiplier)
-            if current_price <= stop_loss_price:
-                return True, portfolio.quantity, f"STOP LOSS triggered at {pnl_pct*100:.2f}%"
+        # 1. Stop Loss (ATR-based) - the stop sits below entry, so only a losing position can hit it
+        if pnl_pct < 0:
+            atr = self._calculate_atr()
+            if atr:
+                stop_loss_price = self.entry_price - (atr * self.stop_loss_atr_multiplier)
+                if current_price <= stop_loss_price:
+                    return True, portfolio.quantity, f"STOP LOSS triggered at {pnl_pct*100:.2f}%"
 
         # 2. Trailing Stop
         if self.highest_price_since_entry:
@@ -376,8 +491,7 @@ class QuantumMomentumProStrategy(BaseStrategy):
                 return True, portfolio.quantity, f"TAKE PROFIT (full exit) at {pnl_pct*100:.2f}%"
 
         # 4. Only exit on extreme overbought with good profit
-        prices = list(self.price_history) + [current_price]
-        rsi = self._calculate_rsi(prices, self.rsi_period)
+        rsi = self._calculate_rsi()
         if rsi and rsi > 80 and pnl_pct > 0.10:  # RSI > 80 AND profit > 10%
             return True, portfolio.quantity * 0.5, f"Extreme overbought exit at {pnl_pct*100:.2f}%"
 
@@ -389,12 +503,17 @@ class QuantumMomentumProStrategy(BaseStrategy):
     def generate_signal(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
         """Main strategy logic - generate buy/sell/hold signals."""
 
-        # Update price history
+        # Update price history and indicator state
+        prev_price = self.price_history[-1] if self.price_history else None
         self.price_history.append(market.current_price)
+        self._update_indicators(market.current_price, prev_price)
+
+        # Portfolio value at this tick, shared by the buy checks and sizing
+        current_value = portfolio.value(market.current_price)
 
         # Initialize starting portfolio value
         if self.starting_portfolio_value is None:
-            self.starting_portfolio_value = portfolio.value(market.current_price)
+            self.starting_portfolio_value = current_value
 
         # Check for sell signals first
         should_sell, sell_size, sell_reason = self._should_sell(market, portfolio)
@@ -408,10 +527,9 @@ class QuantumMomentumProStrategy(BaseStrategy):
             )
 
         # Check for buy signals
-        should_buy, position_pct, buy_reason = self._should_buy(market, portfolio)
+        should_buy, position_pct, buy_reason = self._should_buy(market, portfolio, current_value)
         if should_buy:
             # Calculate position size
-            current_value = portfolio.value(market.current_price)
             position_value = current_value * position_pct
             position_value = min(position_value, portfolio.cash)  # Don't exceed available cash
 
@@ -431,11 +549,13 @@ class QuantumMomentumProStrategy(BaseStrategy):
 
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Update strategy state after trade execution."""
+        ts = timestamp if timestamp else datetime.now(timezone.utc)
+
         if signal.action == "buy" and execution_size > 0:
+            self.last_trade_time = ts.timestamp()
+
             # Update trade count for the month
-            ts = timestamp if timestamp else datetime.now(timezone.utc)
-            month_key = ts.strftime("%Y-%m")
-            self.trade_count_by_month[month_key] = self.trade_count_by_month.get(month_key, 0) + 1
+            self.trade_count_by_month[ts.year * 12 + ts.month] += 1
 
             # Calculate new average entry price
             if self.entry_price and self.current_quantity > 0:
@@ -451,12 +571,14 @@ class QuantumMomentumProStrategy(BaseStrategy):
             self.positions.append({
                 "price": execution_price,
                 "size": execution_size,
-                "timestamp": timestamp.isoformat() if timestamp else datetime.now(timezone.utc).isoformat()
+                "timestamp": self.last_trade_time  # unix seconds
             })
 
             self._logger.info(f"BUY executed: {execution_size:.8f} @ ${execution_price:,.2f}")
 
         elif signal.action == "sell" and execution_size > 0:
+            self.last_trade_time = ts.timestamp()
+
             # Update quantity
             self.current_quantity -= execution_size
 
@@ -488,8 +610,19 @@ class QuantumMomentumProStrategy(BaseStrategy):
             "highest_price_since_entry": self.highest_price_since_entry,
             "starting_portfolio_value": self.starting_portfolio_value,
             "current_quantity": self.current_quantity,
-            "trade_count_by_month": self.trade_count_by_month,
-            "price_history": list(self.price_history)
+            "trade_count_by_month": {f"{(month_key - 1) // 12:04d}-{(month_key - 1) % 12 + 1:02d}": count
+                                     for month_key, count in self.trade_count_by_month.items()},
+            "last_trade_time": self.last_trade_time,
+            "price_history": list(self.price_history),
+            "ema_state": self._ema_state,
+            "ema_seed_sum": self._ema_seed_sum,
+            "ema_seed_count": self._ema_seed_count,
+            "macd_signal_ema": self._macd_signal_ema,
+            "macd_seed_sum": self._macd_seed_sum,
+            "macd_seed_count": self._macd_seed_count,
+            "rsi_avg_gain": self._rsi_avg_gain,
+            "rsi_avg_loss": self._rsi_avg_loss,
+            "rsi_count": self._rsi_count,
         }
 
     def set_state(self, state: Dict[str, Any]) -> None:
@@ -499,11 +632,36 @@ class QuantumMomentumProStrategy(BaseStrategy):
         self.highest_price_since_entry = state.get("highest_price_since_entry")
         self.starting_portfolio_value = state.get("starting_portfolio_value")
         self.current_quantity = state.get("current_quantity", 0.0)
-        self.trade_count_by_month = state.get("trade_count_by_month", {})
+        # Persisted as "YYYY-MM" strings, which JSON can use as keys
+        self.trade_count_by_month = defaultdict(int, {int(key[:4]) * 12 + int(key[5:7]): count
+                                                      for key, count in state.get("trade_count_by_month", {}).items()})
+        self.last_trade_time = state.get("last_trade_time")
 
         if "price_history" in state:
             self.price_history = deque(state["price_history"], maxlen=self.price_history.maxlen)
 
+        # States saved without the MACD signal line are replayed from history
+        if "ema_state" in state and "macd_seed_count" in state:
+            # JSON round-trips turn the integer period keys into strings
+            self._ema_state = {int(period): ema for period, ema in state["ema_state"].items()}
+            self._ema_seed_sum = state.get("ema_seed_sum", 0.0)
+            self._ema_seed_count = state.get("ema_seed_count", 0)
+            self._macd_signal_ema = state.get("macd_signal_ema")
+            self._macd_seed_sum = state.get("macd_seed_sum", 0.0)
+            self._macd_seed_count = state.get("macd_seed_count", 0)
+        else:
+            self._rebuild_emas()
+
+        if "rsi_count" in state:
+            self._rsi_avg_gain = state.get("rsi_avg_gain", 0.0)
+            self._rsi_avg_loss = state.get("rsi_avg_loss", 0.0)
+            self._rsi_count = state["rsi_count"]
+        else:
+            self._rebuild_rsi()
+
+        self._rebuild_bands()
+        self._rebuild_atr()
+
 
 # Register the strategy
 register_strategy("quantum_momentum_pro", lambda cfg, ex: QuantumMomentumProStrategy(cfg, ex))
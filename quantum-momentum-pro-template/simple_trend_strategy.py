@@ -11,24 +11,23 @@ Frequency: Max 3 trades/month
 
 from __future__ import annotations
 
-import sys
-import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-from collections import deque
-from statistics import mean
+from typing import Any, DefaultDict, Dict, Optional
+from collections import defaultdict, deque
+from itertools import islice
 import logging
 
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 from strategy_interface import BaseStrategy, Signal, Portfolio, register_strategy
 from exchange_interface import MarketSnapshot
 
+# Shared hold signals for the fixed-reason paths; callers treat signals as read-only
+_HOLD_WARMUP = Signal("hold", reason="Warming up")
+_HOLD_IN_POSITION = Signal("hold", reason="Already in position")
+_HOLD_CALCULATING = Signal("hold", reason="Calculating indicators")
+_HOLD_NO_SETUP = Signal("hold", reason="Waiting for trend entry")
+
 
 class SimpleTrendStrategy(BaseStrategy):
     """Dead simple trend following strategy optimized for 2024 crypto bull market.
@@ -40,6 +39,15 @@ class SimpleTrendStrategy(BaseStrategy):
     - Frequency: Max 3/month to avoid overtrading
     """
 
+    __slots__ = (
+        "trend_ema_period", "momentum_period", "position_pct",
+        "take_profit_pct", "stop_loss_pct", "trailing_stop_pct",
+        "max_trades_per_month", "trade_count_by_month",
+        "entry_price", "highest_price_since_entry", "price_history",
+        "_ema", "_ema_seed_sum", "_ema_seed_count", "_ema_alpha", "_ema_beta",
+        "_logger",
+    )
+
     def __init__(self, config: Dict[str, Any], exchange):
         super().__init__(config=config, exchange=exchange)
 
@@ -59,100 +67,118 @@ class SimpleTrendStrategy(BaseStrategy):
 
         # Trade frequency control
         self.max_trades_per_month = int(config.get("max_trades_per_month", 3))
-        self.trade_count_by_month: Dict[str, int] = {}
+        self.trade_count_by_month: DefaultDict[int, int] = defaultdict(int)  # keyed by year * 12 + month
 
         # State
         self.entry_price: Optional[float] = None
         self.highest_price_since_entry: Optional[float] = None
         self.price_history = deque(maxlen=max(self.trend_ema_period, self.momentum_period) + 50)
 
-        self._logger = logging.getLogger("strategy.simple_trend")
-
-    def _calculate_ema(self, prices: List[float], period: int) -> Optional[float]:
-        """Calculate EMA."""
-        if len(prices) < period:
-            return None
-
-        multiplier = 2 / (period + 1)
-        ema = mean(prices[:period])
-
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
+        # Incremental trend EMA, seeded with the SMA of the first trend_ema_period prices
+        self._ema: Optional[float] = None
+        self._ema_seed_sum: float = 0.0
+        self._ema_seed_count: int = 0
+        self._ema_alpha: float = 2 / (self.trend_ema_period + 1)
+        self._ema_beta: float = 1 - self._ema_alpha
 
-        return ema
+        self._logger = logging.getLogger("strategy.simple_trend")
 
-    def _is_new_high(self, prices: List[float], period: int) -> bool:
+    def _update_ema(self, price: float) -> None:
+        """Fold the newest price into the trend EMA."""
+        period = self.trend_ema_period
+        if self._ema is not None:
+            self._ema = (price * self._ema_alpha) + (self._ema * self._ema_beta)
+            return
+
+        self._ema_seed_count += 1
+        self._ema_seed_sum += price
+        if self._ema_seed_count == period:
+            self._ema = self._ema_seed_sum / period
+
+    def _rebuild_ema(self) -> None:
+        """Recompute the trend EMA from the stored price history."""
+        self._ema = None
+        self._ema_seed_sum = 0.0
+        self._ema_seed_count = 0
+        for price in self.price_history:
+            self._update_ema(price)
+
+    def _is_new_high(self, period: int) -> bool:
         """Check if current price is making a new high."""
+        prices = self.price_history
         if len(prices) < period + 1:
             return False
 
+        # Walk back from the newest price so only the window is visited
         current = prices[-1]
-        previous_highs = prices[-(period+1):-1]
+        previous_highs = islice(reversed(prices), 1, period + 1)
         return current > max(previous_highs)
 
     def generate_signal(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
         """Simple trend following logic."""
 
+        current_price = market.current_price
+        qty = portfolio.quantity
+
         # Build price history
-        self.price_history.append(market.current_price)
-        prices = list(self.price_history)
+        self.price_history.append(current_price)
+        self._update_ema(current_price)
 
         # Need enough data
-        if len(prices) < self.trend_ema_period:
-            return Signal("hold", reason="Warming up")
-
-        current_price = market.current_price
+        if len(self.price_history) < self.trend_ema_period:
+            return _HOLD_WARMUP
 
         # === SELL LOGIC (Check first) ===
-        if portfolio.quantity > 0 and self.entry_price:
+        if qty > 0 and self.entry_price:
             # Track highest price
-            if self.highest_price_since_entry is None or current_price > self.highest_price_since_entry:
-                self.highest_price_since_entry = current_price
+            highest = self.highest_price_since_entry
+            if highest is None or current_price > highest:
+                highest = self.highest_price_since_entry = current_price
 
             pnl_pct = (current_price - self.entry_price) / self.entry_price
 
             # Take profit (6% target)
             if pnl_pct >= self.take_profit_pct:
-                self._logger.info(f"TAKE PROFIT: {pnl_pct*100:.2f}%")
-                return Signal("sell", size=portfolio.quantity,
+                self._logger.info("TAKE PROFIT: %.2f%%", pnl_pct*100)
+                return Signal("sell", size=qty,
                             reason=f"Take profit at +{pnl_pct*100:.1f}%",
                             entry_price=self.entry_price)
 
             # Trailing stop (4% from peak)
-            if self.highest_price_since_entry:
-                trailing_pct = (self.highest_price_since_entry - current_price) / self.highest_price_since_entry
+            if highest:
+                trailing_pct = (highest - current_price) / highest
                 if trailing_pct >= self.trailing_stop_pct and pnl_pct > 0:  # Only if in profit
-                    self._logger.info(f"TRAILING STOP: {pnl_pct*100:.2f}%")
-                    return Signal("sell", size=portfolio.quantity,
+                    self._logger.info("TRAILING STOP: %.2f%%", pnl_pct*100)
+                    return Signal("sell", size=qty,
                                 reason=f"Trailing stop at +{pnl_pct*100:.1f}%",
                                 entry_price=self.entry_price)
 
             # Stop loss (5% max loss)
             if pnl_pct <= -self.stop_loss_pct:
-                self._logger.info(f"STOP LOSS: {pnl_pct*100:.2f}%")
-                return Signal("sell", size=portfolio.quantity,
+                self._logger.info("STOP LOSS: %.2f%%", pnl_pct*100)
+                return Signal("sell", size=qty,
                             reason=f"Stop loss at {pnl_pct*100:.1f}%",
                             entry_price=self.entry_price)
 
         # === BUY LOGIC ===
 
         # Don't buy if already holding
-        if portfolio.quantity > 0:
-            return Signal("hold", reason="Already in position")
+        if qty > 0:
+            return _HOLD_IN_POSITION
 
         # Trade frequency limit
         if market.timestamp:
-            month_key = market.timestamp.strftime("%Y-%m")
+            month_key = market.timestamp.year * 12 + market.timestamp.month
             trades_this_month = self.trade_count_by_month.get(month_key, 0)
             if trades_this_month >= self.max_trades_per_month:
                 return Signal("hold", reason=f"Monthly limit ({trades_this_month}/{self.max_trades_per_month})")
 
         # Calculate indicators
-        ema = self._calculate_ema(prices, self.trend_ema_period)
-        is_new_high = self._is_new_high(prices, self.momentum_period)
+        ema = self._ema
+        is_new_high = self._is_new_high(self.momentum_period)
 
         if not ema:
-            return Signal("hold", reason="Calculating indicators")
+            return _HOLD_CALCULATING
 
         # MOMENTUM BREAKOUT ENTRY:
         # 1. Price above EMA(20) - general uptrend
@@ -164,11 +190,11 @@ class SimpleTrendStrategy(BaseStrategy):
             size = position_value / current_price
 
             if size > 0:
-                self._logger.info(f"BUY SIGNAL: Momentum breakout @ {current_price:.2f}")
+                self._logger.info("BUY SIGNAL: Momentum breakout @ %.2f", current_price)
                 return Signal("buy", size=size,
                             reason=f"Momentum breakout (new {self.momentum_period}-period high)")
 
-        return Signal("hold", reason="Waiting for trend entry")
+        return _HOLD_NO_SETUP
 
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Track trades."""
@@ -178,13 +204,13 @@ class SimpleTrendStrategy(BaseStrategy):
 
             # Update trade count
             ts = timestamp if timestamp else datetime.now(timezone.utc)
-            month_key = ts.strftime("%Y-%m")
-            self.trade_count_by_month[month_key] = self.trade_count_by_month.get(month_key, 0) + 1
+            self.trade_count_by_month[ts.year * 12 + ts.month] += 1
 
-            self._logger.info(f"BUY: {execution_size:.8f} @ ${execution_price:,.2f}")
+            if self._logger.isEnabledFor(logging.INFO):  # thousands separators need str.format
+                self._logger.info(f"BUY: {execution_size:.8f} @ ${execution_price:,.2f}")
 
         elif signal.action == "sell" and execution_size > 0:
-            if self.entry_price:
+            if self.entry_price and self._logger.isEnabledFor(logging.INFO):
                 pnl = (execution_price - self.entry_price) * execution_size
                 pnl_pct = (execution_price - self.entry_price) / self.entry_price * 100
                 self._logger.info(f"SELL: {execution_size:.8f} @ ${execution_price:,.2f} | PnL: ${pnl:,.2f} ({pnl_pct:+.2f}%)")
@@ -196,17 +222,30 @@ class SimpleTrendStrategy(BaseStrategy):
         return {
             "entry_price": self.entry_price,
             "highest_price_since_entry": self.highest_price_since_entry,
-            "trade_count_by_month": self.trade_count_by_month,
-            "price_history": list(self.price_history)
+            "trade_count_by_month": {f"{(month_key - 1) // 12:04d}-{(month_key - 1) % 12 + 1:02d}": count
+                                     for month_key, count in self.trade_count_by_month.items()},
+            "price_history": list(self.price_history),
+            "ema": self._ema,
+            "ema_seed_sum": self._ema_seed_sum,
+            "ema_seed_count": self._ema_seed_count,
         }
 
     def set_state(self, state: Dict[str, Any]) -> None:
         self.entry_price = state.get("entry_price")
         self.highest_price_since_entry = state.get("highest_price_since_entry")
-        self.trade_count_by_month = state.get("trade_count_by_month", {})
+        # Persisted as "YYYY-MM" strings, which JSON can use as keys
+        self.trade_count_by_month = defaultdict(int, {int(key[:4]) * 12 + int(key[5:7]): count
+                                                      for key, count in state.get("trade_count_by_month", {}).items()})
         if "price_history" in state:
             self.price_history = deque(state["price_history"], maxlen=self.price_history.maxlen)
 
+        if "ema_seed_count" in state:
+            self._ema = state.get("ema")
+            self._ema_seed_sum = state.get("ema_seed_sum", 0.0)
+            self._ema_seed_count = state["ema_seed_count"]
+        else:
+            self._rebuild_ema()
+
 
 # Register the strategy
 register_strategy("simple_trend", lambda cfg, ex: SimpleTrendStrategy(cfg, ex))
@@ -15,24 +15,30 @@ Exit: Only when trend clearly reverses
 
 from __future__ import annotations
 
-import sys
-import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Optional, Tuple
 from collections import deque
-from statistics import mean, stdev
 import logging
 
-# Handle both local development and Docker container paths
-base_path = os.path.join(os.path.dirname(__file__), '..', 'base-bot-template')
-if not os.path.exists(base_path):
-    base_path = '/app/base'
-
-sys.path.insert(0, base_path)
+import _bootstrap  # noqa: F401  (puts the base bot template on sys.path)
 
 from strategy_interface import BaseStrategy, Signal, Portfolio, register_strategy
 from exchange_interface import MarketSnapshot
 
+# Logging is configured once per process and shared by every instance
+_logger = logging.getLogger("TrendRiderStrategy")
+_logger.setLevel(logging.INFO)
+if not _logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _logger.addHandler(_handler)
+
+# Shared hold signals for the fixed-reason paths; callers treat signals as read-only
+_HOLD_WARMUP = Signal("hold", reason="Insufficient data for trend analysis")
+_HOLD_EMA_PENDING = Signal("hold", reason="EMA calculation pending")
+_HOLD_IN_POSITION = Signal("hold", reason="Position already held")
+_HOLD_NO_SETUP = Signal("hold", reason="Waiting for breakout setup")
+
 
 class TrendRiderStrategy(BaseStrategy):
     """Buy the trend and HOLD. Fewer trades, bigger wins.
@@ -53,6 +59,17 @@ class TrendRiderStrategy(BaseStrategy):
     Position: Max 55% per trade
     """
 
+    __slots__ = (
+        "fast_ema_period", "slow_ema_period", "breakout_period", "position_pct",
+        "stop_loss_pct", "trailing_stop_pct", "min_bars_between_trades",
+        "_ema_alpha", "_ema_beta", "_ema_full_decay",
+        "entry_price", "highest_price_since_entry", "current_quantity",
+        "bars_since_last_trade", "last_trade_timestamp", "price_history",
+        "_ema_periods", "_ema_seed_sums", "_ema_tails",
+        "_tick", "_breakout_deque", "_breakout_high",
+        "_logger",
+    )
+
     def __init__(self, config: Dict[str, Any], exchange):
         super().__init__(config=config, exchange=exchange)
 
@@ -83,92 +100,166 @@ class TrendRiderStrategy(BaseStrategy):
         # Price history for calculations
         self.price_history: deque = deque(maxlen=max(self.slow_ema_period, self.breakout_period) + 10)
 
+        # The EMAs run over the history window and are seeded with the SMA of its first
+        # `period` prices, so the seed moves with the window; the trading rules were tuned
+        # on that. Per period this keeps the sum of the seed prices and the decayed
+        # contribution of the prices after them:
+        #   ema = seed_sum / period * beta ** (len(window) - period) + tail
+        self._ema_periods: Tuple[int, ...] = tuple(sorted({self.fast_ema_period, self.slow_ema_period}))
+        self._ema_seed_sums: Dict[int, float] = dict.fromkeys(self._ema_periods, 0.0)
+        self._ema_tails: Dict[int, float] = dict.fromkeys(self._ema_periods, 0.0)
+
+        # Per-tick constants; the seed's decay is fixed once the window is full
+        self._ema_alpha: Dict[int, float] = {period: 2 / (period + 1) for period in self._ema_periods}
+        self._ema_beta: Dict[int, float] = {period: 1 - alpha for period, alpha in self._ema_alpha.items()}
+        self._ema_full_decay: Dict[int, float] = {period: self._ema_beta[period] ** (self.price_history.maxlen - period)
+                                                  for period in self._ema_periods}
+
+        # Monotonic (tick, price) window over the breakout period; _breakout_high
+        # is the highest price of the bars preceding the current one
+        self._tick: int = 0
+        self._breakout_deque: Deque[Tuple[int, float]] = deque()
+        self._breakout_high: Optional[float] = None
+
         # Logging
-        self._logger = logging.getLogger(self.__class__.__name__)
-        self._logger.setLevel(logging.INFO)
-        if not self._logger.handlers:
-            handler = logging.StreamHandler()
-            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-            self._logger.addHandler(handler)
-
-    def _calculate_ema(self, prices: List[float], period: int) -> Optional[float]:
-        """Calculate EMA for given period."""
-        if len(prices) < period:
+        self._logger = _logger
+
+    def _update_indicators(self, price: float) -> None:
+        """Append the newest price to the history and fold it into the EMAs and the breakout window."""
+        self._update_emas(price)
+        self.price_history.append(price)
+        self._track_breakout_high(price)
+
+    def _update_emas(self, price: float) -> None:
+        """Fold the newest price into the windowed EMA sums; called before it joins the history."""
+        history = self.price_history
+        history_len = len(history)
+        full = history_len == history.maxlen
+        alpha = self._ema_alpha
+        beta = self._ema_beta
+        seed_sums = self._ema_seed_sums
+        tails = self._ema_tails
+
+        for period in self._ema_periods:
+            if full:
+                # The oldest price leaves the window and the first tail price becomes part of the seed
+                promoted = history[period]
+                seed_sums[period] += promoted - history[0]
+                tails[period] = (beta[period] * tails[period] + alpha[period] * price
+                                 - alpha[period] * self._ema_full_decay[period] * promoted)
+            elif history_len < period:
+                seed_sums[period] += price
+            else:
+                tails[period] = beta[period] * tails[period] + alpha[period] * price
+
+    def _get_ema(self, period: int) -> Optional[float]:
+        """EMA over the price history window for a tracked period (None while warming up)."""
+        history = self.price_history
+        history_len = len(history)
+        if history_len < period:
             return None
 
-        # Start with SMA
-        ema = mean(prices[:period])
-        multiplier = 2 / (period + 1)
-
-        # Calculate EMA
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-
-        return ema
-
-    def _is_breakout(self, prices: List[float], period: int) -> bool:
+        if history_len == history.maxlen:
+            decay = self._ema_full_decay[period]
+        else:
+            decay = self._ema_beta[period] ** (history_len - period)
+        return self._ema_seed_sums[period] / period * decay + self._ema_tails[period]
+
+    def _rebuild_indicators(self) -> None:
+        """Recompute the EMA sums and the breakout window from the stored price history."""
+        history = self.price_history
+        self.price_history = deque(maxlen=history.maxlen)
+        self._ema_seed_sums = dict.fromkeys(self._ema_periods, 0.0)
+        self._ema_tails = dict.fromkeys(self._ema_periods, 0.0)
+        self._reset_breakout_high()
+        for price in history:
+            self._update_indicators(price)
+
+    def _track_breakout_high(self, price: float) -> None:
+        """Push a price onto the breakout window."""
+        self._tick += 1
+        tick = self._tick
+
+        # Capture the high of the previous bars before the current price joins them
+        breakout_deque = self._breakout_deque
+        while breakout_deque and breakout_deque[0][0] < tick - self.breakout_period:
+            breakout_deque.popleft()
+        self._breakout_high = breakout_deque[0][1] if tick > self.breakout_period else None
+        while breakout_deque and breakout_deque[-1][1] <= price:
+            breakout_deque.pop()
+        breakout_deque.append((tick, price))
+
+    def _reset_breakout_high(self) -> None:
+        """Forget the breakout window."""
+        self._tick = 0
+        self._breakout_deque = deque()
+        self._breakout_high = None
+
+    def _rebuild_breakout_high(self) -> None:
+        """Recreate the breakout window from the stored price history."""
+        self._reset_breakout_high()
+        for price in self.price_history:
+            self._track_breakout_high(price)
+
+    def _is_breakout(self, current_price: float) -> bool:
         """Check if current price is breaking out to new high."""
-        if len(prices) < period + 1:
+        if self._breakout_high is None:
             return False
 
-        current_price = prices[-1]
-        previous_highs = prices[-(period+1):-1]
-        highest_previous = max(previous_highs)
-
         # Must break above previous high by at least 0.5%
-        return current_price > highest_previous * 1.005
+        return current_price > self._breakout_high * 1.005
 
     def generate_signal(self, market: MarketSnapshot, portfolio: Portfolio) -> Signal:
         """Generate trading signal based on trend riding logic."""
 
         # Update price history
         current_price = market.current_price
-        self.price_history.append(current_price)
+        qty = portfolio.quantity
+        self._update_indicators(current_price)
         self.bars_since_last_trade += 1
 
         # Track highest price if holding position
-        if portfolio.quantity > 0:
-            if self.highest_price_since_entry is None or current_price > self.highest_price_since_entry:
+        if qty > 0:
+            highest = self.highest_price_since_entry
+            if highest is None or current_price > highest:
                 self.highest_price_since_entry = current_price
-            self.current_quantity = portfolio.quantity
+            self.current_quantity = qty
 
         # Not enough data yet
         if len(self.price_history) < self.slow_ema_period:
-            return Signal("hold", reason="Insufficient data for trend analysis")
+            return _HOLD_WARMUP
 
-        prices = list(self.price_history)
-
-        # Calculate EMAs
-        fast_ema = self._calculate_ema(prices, self.fast_ema_period)
-        slow_ema = self._calculate_ema(prices, self.slow_ema_period)
+        fast_ema = self._get_ema(self.fast_ema_period)
+        slow_ema = self._get_ema(self.slow_ema_period)
 
         if fast_ema is None or slow_ema is None:
-            return Signal("hold", reason="EMA calculation pending")
+            return _HOLD_EMA_PENDING
 
         # === EXIT LOGIC (check first) ===
-        if portfolio.quantity > 0 and self.entry_price:
+        if qty > 0 and self.entry_price:
             pnl_pct = (current_price - self.entry_price) / self.entry_price
 
             # Exit 1: Price breaks below slow EMA (trend reversal)
             if current_price < slow_ema:
-                self._logger.info(f"TREND REVERSAL: Price {current_price:.2f} < EMA({self.slow_ema_period}) {slow_ema:.2f}")
-                return Signal("sell", size=portfolio.quantity,
+                self._logger.info("TREND REVERSAL: Price %.2f < EMA(%d) %.2f", current_price, self.slow_ema_period, slow_ema)
+                return Signal("sell", size=qty,
                             reason=f"Trend reversal - exit at {pnl_pct*100:+.1f}%",
                             entry_price=self.entry_price)
 
             # Exit 2: Hard stop loss (15% drawdown)
             if pnl_pct <= -self.stop_loss_pct:
-                self._logger.info(f"STOP LOSS HIT: {pnl_pct*100:.1f}%")
-                return Signal("sell", size=portfolio.quantity,
+                self._logger.info("STOP LOSS HIT: %.1f%%", pnl_pct*100)
+                return Signal("sell", size=qty,
                             reason=f"Stop loss at {pnl_pct*100:.1f}%",
                             entry_price=self.entry_price)
 
             # Exit 3: Trailing stop (20% from peak)
-            if self.highest_price_since_entry:
-                drawdown_from_peak = (self.highest_price_since_entry - current_price) / self.highest_price_since_entry
+            highest = self.highest_price_since_entry
+            if highest:
+                drawdown_from_peak = (highest - current_price) / highest
                 if drawdown_from_peak >= self.trailing_stop_pct and pnl_pct > 0:
-                    self._logger.info(f"TRAILING STOP: {drawdown_from_peak*100:.1f}% from peak, profit {pnl_pct*100:.1f}%")
-                    return Signal("sell", size=portfolio.quantity,
+                    self._logger.info("TRAILING STOP: %.1f%% from peak, profit %.1f%%", drawdown_from_peak*100, pnl_pct*100)
+                    return Signal("sell", size=qty,
                                 reason=f"Trailing stop at +{pnl_pct*100:.1f}%",
                                 entry_price=self.entry_price)
 
@@ -177,8 +268,8 @@ class TrendRiderStrategy(BaseStrategy):
 
         # === ENTRY LOGIC ===
         # Already holding? Don't enter again
-        if portfolio.quantity > 0:
-            return Signal("hold", reason="Position already held")
+        if qty > 0:
+            return _HOLD_IN_POSITION
 
         # Respect minimum time between trades
         if self.bars_since_last_trade < self.min_bars_between_trades:
@@ -189,7 +280,7 @@ class TrendRiderStrategy(BaseStrategy):
         # 2. Price well above slow EMA (confirmed uptrend)
         # 3. Fast EMA above slow EMA (trend strength)
 
-        is_breakout = self._is_breakout(prices, self.breakout_period)
+        is_breakout = self._is_breakout(current_price)
         price_above_slow_ema = current_price > slow_ema * 1.02  # At least 2% above
         ema_bullish = fast_ema > slow_ema
 
@@ -200,13 +291,13 @@ class TrendRiderStrategy(BaseStrategy):
             size = position_value / current_price
 
             if size > 0:
-                self._logger.info(f"🚀 BUY SIGNAL: Major breakout @ {current_price:.2f}")
-                self._logger.info(f"   Fast EMA: {fast_ema:.2f}, Slow EMA: {slow_ema:.2f}")
-                self._logger.info(f"   {self.breakout_period}-period breakout confirmed")
+                self._logger.info("🚀 BUY SIGNAL: Major breakout @ %.2f", current_price)
+                self._logger.info("   Fast EMA: %.2f, Slow EMA: %.2f", fast_ema, slow_ema)
+                self._logger.info("   %d-period breakout confirmed", self.breakout_period)
                 return Signal("buy", size=size,
                             reason=f"Major trend breakout - {self.breakout_period}period high")
 
-        return Signal("hold", reason="Waiting for breakout setup")
+        return _HOLD_NO_SETUP
 
     def on_trade(self, signal: Signal, execution_price: float, execution_size: float, timestamp: datetime) -> None:
         """Track trades and update state."""
@@ -216,14 +307,14 @@ class TrendRiderStrategy(BaseStrategy):
             self.current_quantity += execution_size
             self.bars_since_last_trade = 0
             self.last_trade_timestamp = timestamp
-            self._logger.info(f"✅ ENTERED: {execution_size:.4f} @ ${execution_price:.2f}")
+            self._logger.info("✅ ENTERED: %.4f @ $%.2f", execution_size, execution_price)
 
         elif signal.action == "sell" and execution_size > 0:
             pnl = (execution_price - self.entry_price) * execution_size if self.entry_price else 0
             pnl_pct = ((execution_price - self.entry_price) / self.entry_price * 100) if self.entry_price else 0
 
-            self._logger.info(f"✅ EXITED: {execution_size:.4f} @ ${execution_price:.2f}")
-            self._logger.info(f"   P&L: ${pnl:.2f} ({pnl_pct:+.1f}%)")
+            self._logger.info("✅ EXITED: %.4f @ $%.2f", execution_size, execution_price)
+            self._logger.info("   P&L: $%.2f (%+.1f%%)", pnl, pnl_pct)
 
             # Reset state
             self.current_quantity -= execution_size
@@ -241,7 +332,9 @@ class TrendRiderStrategy(BaseStrategy):
             "highest_price_since_entry": self.highest_price_since_entry,
             "current_quantity": self.current_quantity,
             "bars_since_last_trade": self.bars_since_last_trade,
-            "price_history": list(self.price_history)
+            "price_history": list(self.price_history),
+            "ema_seed_sums": self._ema_seed_sums,
+            "ema_tails": self._ema_tails,
         }
 
     def set_state(self, state: Dict[str, Any]) -> None:
@@ -254,6 +347,15 @@ class TrendRiderStrategy(BaseStrategy):
             self.price_history = deque(state["price_history"],
                                        maxlen=max(self.slow_ema_period, self.breakout_period) + 10)
 
+        # States saved without the EMA sums are replayed from history
+        if "ema_tails" in state:
+            # JSON round-trips turn the integer period keys into strings
+            self._ema_seed_sums = {int(period): total for period, total in state["ema_seed_sums"].items()}
+            self._ema_tails = {int(period): tail for period, tail in state["ema_tails"].items()}
+            self._rebuild_breakout_high()
+        else:
+            self._rebuild_indicators()
+
 
 # Register this strategy
 register_strategy("trend_rider", TrendRiderStrategy)
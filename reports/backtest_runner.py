@@ -12,9 +12,12 @@ Contest Requirements:
 
 import sys
 import os
-from datetime import datetime, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import json
+import pickle
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Add paths for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'base-bot-template'))
@@ -27,38 +30,140 @@ except ImportError:
     print("ERROR: yfinance not installed. Run: pip install yfinance")
     sys.exit(1)
 
+import numpy as np  # installed alongside yfinance (via pandas)
+import pandas as pd
+
+try:  # optional, faster results dump
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 # Import strategy components
 from strategy_interface import Portfolio, Signal
 from exchange_interface import MarketSnapshot
 from trend_rider_strategy import TrendRiderStrategy
 from eth_dip_buyer import EthDipBuyer
 
+# Downloaded candles are kept here between runs; set TRADE_DISABLE_YF_CACHE=1 to refetch
+# (that skips the in-process cache below as well)
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".yf_cache")
+
+# Candles already loaded in this process, shared by every engine (callers must not mutate them)
+_history_cache: Dict[Tuple[str, str, str, str], pd.DataFrame] = {}
+
+
+def _is_transient(error: Exception) -> bool:
+    """True for failures worth retrying: network trouble, rate limits and 5xx responses."""
+    if "RateLimit" in type(error).__name__:
+        return True
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # requests' exceptions derive from OSError, as do socket errors and timeouts
+    return isinstance(error, OSError)
+
+
+def _download_with_retry(symbol: str, start_date: str, end_date: str, interval: str,
+                         attempts: int = 3) -> pd.DataFrame:
+    """Download candles, retrying transient failures with exponential backoff.
+
+    Anything that is not transient (bad arguments, 4xx responses) is raised at once.
+    An empty result is retried too, since Yahoo answers throttled requests that way.
+    """
+    for attempt in range(attempts):
+        last_try = attempt == attempts - 1
+        try:
+            data = yf.Ticker(symbol).history(start=start_date, end=end_date, interval=interval)
+        except Exception as e:
+            if last_try or not _is_transient(e):
+                raise
+            print(f"   ⚠️  {symbol} download failed ({e}), retrying...")
+        else:
+            if last_try or (data is not None and not data.empty):
+                return data
+            print(f"   ⚠️  {symbol} download came back empty, retrying...")
+        time.sleep(0.5 * 2 ** attempt)
+
+
+def load_history(symbol: str, start_date: str, end_date: str, interval: str = "1h") -> pd.DataFrame:
+    """Fetch candles from Yahoo Finance, reusing a copy already loaded in memory or on disk."""
+    use_cache = os.environ.get("TRADE_DISABLE_YF_CACHE") != "1"
+    key = (symbol, start_date, end_date, interval)
+    if use_cache and key in _history_cache:
+        return _history_cache[key]
+
+    # Pickle keeps the tz-aware index and dtypes without needing pyarrow
+    cache_path = os.path.join(CACHE_DIR, f"{symbol}_{start_date}_{end_date}_{interval}.pkl")
+
+    data = None
+    if use_cache and os.path.exists(cache_path):
+        try:
+            data = pd.read_pickle(cache_path)
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError) as e:
+            print(f"   ⚠️  {symbol} cache file unreadable ({e!r}), downloading again...")
+            os.remove(cache_path)
+
+    if data is None:
+        data = _download_with_retry(symbol, start_date, end_date, interval)
+
+        if use_cache and data is not None and not data.empty:
+            # Write beside the target and swap it in, so an interrupted run never leaves a truncated pickle
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            os.close(fd)
+            try:
+                data.to_pickle(tmp_path)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    # Empty downloads are usually rate limiting, so leave them out and try again next time
+    if use_cache and data is not None and not data.empty:
+        _history_cache[key] = data
+
+    return data
+
 
 class BacktestEngine:
     """Simple backtest engine for contest verification."""
 
-    def __init__(self, symbol: str, start_date: str, end_date: str, starting_cash: float = 10000.0):
+    def __init__(self, symbol: str, start_date: str, end_date: str, starting_cash: float = 10000.0,
+                 verbose: bool = True, data: Optional[pd.DataFrame] = None):
         self.symbol = symbol
         self.start_date = start_date
         self.end_date = end_date
         self.starting_cash = starting_cash
+        self.verbose = verbose  # print every fill as it happens
 
         # Portfolio state
         self.cash = starting_cash
         self.quantity = 0.0
 
+        # Cost basis of the open position, kept current as fills happen
+        self._total_buy_cost = 0.0
+        self._total_buy_size = 0.0
+
         # Performance tracking
-        self.trades: List[Dict[str, Any]] = []
-        self.portfolio_values: List[float] = []
-        self.timestamps: List[datetime] = []
+        # Trade log kept as columns; the `trades` property builds the dicts for output
+        self._trade_ts: List[Any] = []
+        self._trade_sides: List[str] = []
+        self._trade_prices: List[float] = []
+        self._trade_sizes: List[float] = []
+        self._trade_amounts: List[float] = []  # cost for buys, proceeds for sells
+        self._trade_pnls: List[Optional[float]] = []  # None for buys
+        self._trade_reasons: List[str] = []
+        self._n_buys = 0
+        self._n_sells = 0
+        self._n_wins = 0
 
         # Load data
         print(f"\n📊 Loading {symbol} data from Yahoo Finance...")
         print(f"   Period: {start_date} to {end_date}")
         print(f"   Interval: 1 hour")
 
-        ticker = yf.Ticker(symbol)
-        self.data = ticker.history(start=start_date, end=end_date, interval="1h")
+        # Candles fetched up front by the caller, or downloaded here
+        self.data = data if data is not None else load_history(symbol, start_date, end_date, interval="1h")
 
         if self.data is None:
             raise ValueError(f"No data received for {symbol} - got None")
@@ -68,6 +173,13 @@ class BacktestEngine:
 
         print(f"   ✅ Loaded {len(self.data)} hourly candles")
 
+        # Close prices as one contiguous array; each bar sees a zero-copy prefix view
+        self._closes = self.data['Close'].to_numpy(dtype=np.float64)
+
+        # One portfolio value per candle, written by index; the timestamps are the data index itself
+        self.portfolio_values: np.ndarray = np.empty(len(self._closes), dtype=np.float64)
+        self.timestamps = self.data.index
+
     def run(self, strategy_config: Dict[str, Any]) -> Dict[str, Any]:
         """Run backtest with given strategy configuration."""
         print(f"\n🚀 Starting backtest for {self.symbol}...")
@@ -92,20 +204,22 @@ class BacktestEngine:
             quantity=self.quantity
         )
 
-        # Iterate through each candle
-        for i, (timestamp, row) in enumerate(self.data.iterrows()):
-            current_price = float(row['Close'])
+        closes = self._closes
 
-            # Build price history
-            prices = self.data['Close'].iloc[:i+1].tolist()
+        # One market snapshot for the whole run, refreshed in place every bar
+        market = MarketSnapshot(
+            symbol=self.symbol,
+            current_price=0.0,
+            prices=closes[:0],
+            timestamp=self.data.index[0]
+        )
 
-            # Create market snapshot
-            market = MarketSnapshot(
-                symbol=self.symbol,
-                current_price=current_price,
-                prices=prices,
-                timestamp=timestamp
-            )
+        # Iterate through each candle; tolist() yields plain Python floats for the strategy
+        for i, (timestamp, current_price) in enumerate(zip(self.data.index, closes.tolist())):
+            # Refresh the snapshot; prices is the history up to and including this bar
+            market.current_price = current_price
+            market.prices = closes[:i+1]
+            market.timestamp = timestamp
 
             # Update portfolio
             portfolio.cash = self.cash
@@ -124,21 +238,17 @@ class BacktestEngine:
                     cost = actual_size * current_price
                     self.cash -= cost
                     self.quantity += actual_size
+                    self._total_buy_cost += cost
+                    self._total_buy_size += actual_size
 
-                    trade = {
-                        "timestamp": timestamp.isoformat(),
-                        "side": "buy",
-                        "price": current_price,
-                        "size": actual_size,
-                        "cost": cost,
-                        "reason": signal.reason
-                    }
-                    self.trades.append(trade)
+                    self._record_trade(timestamp, "buy", current_price, actual_size, cost, None, signal.reason)
+                    self._n_buys += 1
 
                     # Notify strategy
                     strategy.on_trade(signal, current_price, actual_size, timestamp)
 
-                    print(f"   BUY  {actual_size:.8f} @ ${current_price:,.2f} | Cash: ${self.cash:,.2f}")
+                    if self.verbose:
+                        print(f"   BUY  {actual_size:.8f} @ ${current_price:,.2f} | Cash: ${self.cash:,.2f}")
 
             elif signal.action == "sell" and signal.size > 0:
                 # Sell up to available quantity
@@ -149,33 +259,31 @@ class BacktestEngine:
                     self.cash += proceeds
                     self.quantity -= actual_size
 
-                    # Find matching buy for P&L calculation
+                    # Average-cost P&L; the sold share of the cost basis leaves with it
                     avg_buy_price = self._calculate_avg_buy_price()
                     pnl = (current_price - avg_buy_price) * actual_size if avg_buy_price else 0
+                    self._total_buy_size -= actual_size
+                    self._total_buy_cost -= avg_buy_price * actual_size
+                    # Clear float residue once flat so the next position starts from a clean basis
+                    if self.quantity <= 1e-12:
+                        self._total_buy_cost = self._total_buy_size = 0.0
 
-                    trade = {
-                        "timestamp": timestamp.isoformat(),
-                        "side": "sell",
-                        "price": current_price,
-                        "size": actual_size,
-                        "proceeds": proceeds,
-                        "pnl": pnl,
-                        "reason": signal.reason
-                    }
-                    self.trades.append(trade)
+                    self._record_trade(timestamp, "sell", current_price, actual_size, proceeds, pnl, signal.reason)
+                    self._n_sells += 1
+                    if pnl > 0:
+                        self._n_wins += 1
 
                     # Notify strategy
                     strategy.on_trade(signal, current_price, actual_size, timestamp)
 
-                    print(f"   SELL {actual_size:.8f} @ ${current_price:,.2f} | Cash: ${self.cash:,.2f} | PnL: ${pnl:,.2f}")
+                    if self.verbose:
+                        print(f"   SELL {actual_size:.8f} @ ${current_price:,.2f} | Cash: ${self.cash:,.2f} | PnL: ${pnl:,.2f}")
 
             # Track portfolio value
-            portfolio_value = self.cash + (self.quantity * current_price)
-            self.portfolio_values.append(portfolio_value)
-            self.timestamps.append(timestamp)
+            self.portfolio_values[i] = self.cash + (self.quantity * current_price)
 
         # Calculate final metrics
-        final_price = float(self.data['Close'].iloc[-1])
+        final_price = closes.item(-1)
         final_value = self.cash + (self.quantity * final_price)
         total_return = (final_value - self.starting_cash) / self.starting_cash
         total_pnl = final_value - self.starting_cash
@@ -184,66 +292,67 @@ class BacktestEngine:
         print(f"   Final value: ${final_value:,.2f}")
         print(f"   Total return: {total_return*100:.2f}%")
         print(f"   Total P&L: ${total_pnl:,.2f}")
-        print(f"   Trades: {len(self.trades)}")
+        print(f"   Trades: {len(self._trade_sides)}")
 
         # Calculate metrics
         metrics = self._calculate_metrics(final_value, total_return, total_pnl)
 
         return metrics
 
+    def _record_trade(self, timestamp: Any, side: str, price: float, size: float, amount: float,
+                      pnl: Optional[float], reason: str) -> None:
+        """Append one fill to the trade columns."""
+        self._trade_ts.append(timestamp)
+        self._trade_sides.append(side)
+        self._trade_prices.append(price)
+        self._trade_sizes.append(size)
+        self._trade_amounts.append(amount)
+        self._trade_pnls.append(pnl)
+        self._trade_reasons.append(reason)
+
+    @property
+    def trades(self) -> List[Dict[str, Any]]:
+        """Trade log as one dict per fill, in the shape written to the results file."""
+        trades = []
+        for timestamp, side, price, size, amount, pnl, reason in zip(
+                self._trade_ts, self._trade_sides, self._trade_prices, self._trade_sizes,
+                self._trade_amounts, self._trade_pnls, self._trade_reasons):
+            if side == "buy":
+                trade = {"timestamp": timestamp.isoformat(), "side": side, "price": price,
+                         "size": size, "cost": amount, "reason": reason}
+            else:
+                trade = {"timestamp": timestamp.isoformat(), "side": side, "price": price,
+                         "size": size, "proceeds": amount, "pnl": pnl, "reason": reason}
+            trades.append(trade)
+        return trades
+
     def _calculate_avg_buy_price(self) -> float:
-        """Calculate average buy price from trade history."""
-        total_cost = 0.0
-        total_size = 0.0
-
-        for trade in self.trades:
-            if trade["side"] == "buy":
-                total_cost += trade["cost"]
-                total_size += trade["size"]
-            elif trade["side"] == "sell":
-                # FIFO: reduce total size
-                total_size -= trade["size"]
-
-        if total_size > 0 and total_cost > 0:
-            return total_cost / total_size
+        """Average buy price of the open position."""
+        if self._total_buy_size > 0 and self._total_buy_cost > 0:
+            return self._total_buy_cost / self._total_buy_size
         return 0.0
 
     def _calculate_metrics(self, final_value: float, total_return: float, total_pnl: float) -> Dict[str, Any]:
         """Calculate comprehensive performance metrics."""
 
-        # Trade statistics
-        buy_trades = [t for t in self.trades if t["side"] == "buy"]
-        sell_trades = [t for t in self.trades if t["side"] == "sell"]
-        total_trades = len(self.trades)
+        # Trade statistics (counted as the trades happened)
+        total_trades = len(self._trade_sides)
 
         # Win rate
-        winning_trades = [t for t in sell_trades if t.get("pnl", 0) > 0]
-        win_rate = len(winning_trades) / len(sell_trades) if sell_trades else 0
+        win_rate = self._n_wins / self._n_sells if self._n_sells else 0
 
-        # Max drawdown
-        max_drawdown = 0.0
-        peak_value = self.starting_cash
+        values = self.portfolio_values
 
-        for value in self.portfolio_values:
-            if value > peak_value:
-                peak_value = value
-            drawdown = (peak_value - value) / peak_value
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
+        # Max drawdown against the running peak (starting cash counts as the first peak)
+        peaks = np.maximum.accumulate(np.concatenate(([self.starting_cash], values)))[1:]
+        max_drawdown = float(((peaks - values) / peaks).max(initial=0.0))
 
         # Sharpe ratio (simplified - assuming risk-free rate = 0)
-        if len(self.portfolio_values) > 1:
-            returns = []
-            for i in range(1, len(self.portfolio_values)):
-                ret = (self.portfolio_values[i] - self.portfolio_values[i-1]) / self.portfolio_values[i-1]
-                returns.append(ret)
-
-            if returns:
-                mean_return = sum(returns) / len(returns)
-                std_return = (sum((r - mean_return) ** 2 for r in returns) / len(returns)) ** 0.5
-                sharpe_ratio = (mean_return / std_return) * (len(returns) ** 0.5) if std_return > 0 else 0
-            else:
-                sharpe_ratio = 0
+        if values.size > 1:
+            returns = np.diff(values) / values[:-1]
+            mean_return = float(returns.mean())
+            std_return = float(returns.std())
+            sharpe_ratio = (mean_return / std_return) * (returns.size ** 0.5) if std_return > 0 else 0
         else:
             sharpe_ratio = 0
 
@@ -254,8 +363,8 @@ class BacktestEngine:
             "total_return_pct": total_return * 100,
             "total_pnl": total_pnl,
             "total_trades": total_trades,
-            "buy_trades": len(buy_trades),
-            "sell_trades": len(sell_trades),
+            "buy_trades": self._n_buys,
+            "sell_trades": self._n_sells,
             "win_rate_pct": win_rate * 100,
             "max_drawdown_pct": max_drawdown * 100,
             "sharpe_ratio": sharpe_ratio,
@@ -265,8 +374,11 @@ class BacktestEngine:
         return metrics
 
 
-def run_contest_backtest():
-    """Run official contest backtest on BTC-USD and ETH-USD."""
+def run_contest_backtest(verbose: bool = True):
+    """Run official contest backtest on BTC-USD and ETH-USD.
+
+    With verbose=False the individual fills are not printed, only the summaries.
+    """
 
     print("=" * 80)
     print("🏆 TRADING STRATEGY CONTEST - BACKTEST RUNNER")
@@ -304,25 +416,24 @@ def run_contest_backtest():
     end_date = "2024-06-30"
     starting_cash = 10000.0
 
-    results = {}
-
-    # Test BTC-USD
-    try:
-        btc_engine = BacktestEngine("BTC-USD", start_date, end_date, starting_cash)
-        btc_results = btc_engine.run(btc_config)
-        results["BTC-USD"] = btc_results
-    except Exception as e:
-        print(f"\n❌ BTC-USD backtest failed: {e}")
-        results["BTC-USD"] = {"error": str(e)}
-
-    # Test ETH-USD
-    try:
-        eth_engine = BacktestEngine("ETH-USD", start_date, end_date, starting_cash)
-        eth_results = eth_engine.run(eth_config)
-        results["ETH-USD"] = eth_results
-    except Exception as e:
-        print(f"\n❌ ETH-USD backtest failed: {e}")
-        results["ETH-USD"] = {"error": str(e)}
+    def run_symbol(symbol: str, config: Dict[str, Any], data: "Future[pd.DataFrame]") -> Dict[str, Any]:
+        try:
+            engine = BacktestEngine(symbol, start_date, end_date, starting_cash, verbose=verbose,
+                                    data=data.result())
+            return engine.run(config)
+        except Exception as e:
+            print(f"\n❌ {symbol} backtest failed: {e}")
+            return {"error": str(e)}
+
+    # Download both histories side by side, then simulate one symbol at a time so each
+    # run's output stays together (the simulation holds the GIL, so it would not overlap anyway)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        btc_data = executor.submit(load_history, "BTC-USD", start_date, end_date, "1h")
+        eth_data = executor.submit(load_history, "ETH-USD", start_date, end_date, "1h")
+        results = {
+            "BTC-USD": run_symbol("BTC-USD", btc_config, btc_data),
+            "ETH-USD": run_symbol("ETH-USD", eth_config, eth_data),
+        }
 
     # Calculate combined results
     print("\n" + "=" * 80)
@@ -371,17 +482,23 @@ def run_contest_backtest():
 
     # Save results to JSON
     output_file = os.path.join(os.path.dirname(__file__), "backtest_results.json")
-    with open(output_file, 'w') as f:
-        json.dump({
-            "combined_return_pct": combined_return,
-            "combined_pnl": combined_pnl,
-            "total_trades": total_trades,
-            "avg_win_rate_pct": avg_win_rate,
-            "max_drawdown_pct": max_drawdown,
-            "btc_results": results.get("BTC-USD", {}),
-            "eth_results": results.get("ETH-USD", {}),
-            "beats_current_leader": beats_leader
-        }, f, indent=2, default=str)
+    payload = {
+        "combined_return_pct": combined_return,
+        "combined_pnl": combined_pnl,
+        "total_trades": total_trades,
+        "avg_win_rate_pct": avg_win_rate,
+        "max_drawdown_pct": max_drawdown,
+        "btc_results": results.get("BTC-USD", {}),
+        "eth_results": results.get("ETH-USD", {}),
+        "beats_current_leader": beats_leader
+    }
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(payload, default=str,
+                                 option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(payload, f, indent=2, default=str)
 
     print(f"💾 Results saved to: {output_file}\n")
 
@@ -389,4 +506,4 @@ def run_contest_backtest():
 
 
 if __name__ == "__main__":
-    run_contest_backtest()
+    run_contest_backtest(verbose="--quiet" not in sys.argv[1:])
@@ -0,0 +1,81 @@
+"""Shared fixtures: a fixed synthetic price series and a signal replay loop."""
+
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "quantum-momentum-pro-template"))
+sys.path.insert(0, os.path.join(ROOT, "reports"))
+
+import _bootstrap  # noqa: E402,F401  (puts the base bot template on sys.path)
+
+from strategy_interface import Portfolio  # noqa: E402
+from exchange_interface import MarketSnapshot  # noqa: E402
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_prices(count, start_price, seed):
+    """Hourly random walk with a mild upward drift; the same seed gives the same series."""
+    rng = random.Random(seed)
+    prices = []
+    price = start_price
+    for _ in range(count):
+        price *= 1 + rng.gauss(0.0004, 0.012)
+        prices.append(price)
+    return prices
+
+
+@pytest.fixture
+def btc_prices():
+    return make_prices(1500, 45000.0, seed=7)
+
+
+@pytest.fixture
+def eth_prices():
+    return make_prices(1500, 2500.0, seed=11)
+
+
+def _replay(factory, prices, split=None):
+    """Feed `prices` to a fresh strategy, filling every signal in full.
+
+    With `split`, the strategy is swapped at that bar for a new instance restored
+    from a JSON round-trip of get_state(). Returns one (action, reason, size) per bar.
+    """
+    strategy = factory()
+    portfolio = Portfolio(symbol="TEST", cash=10000.0, quantity=0.0)
+    signals = []
+
+    for i, price in enumerate(prices):
+        if i == split:
+            state = json.loads(json.dumps(strategy.get_state()))
+            strategy = factory()
+            strategy.set_state(state)
+
+        timestamp = START + timedelta(hours=i)
+        market = MarketSnapshot(symbol="TEST", prices=prices[:i + 1], current_price=price, timestamp=timestamp)
+        signal = strategy.generate_signal(market, portfolio)
+        signals.append((signal.action, signal.reason, signal.size))
+
+        if signal.action == "buy" and signal.size > 0:
+            size = min(signal.size, portfolio.cash / price)
+            portfolio.cash -= size * price
+            portfolio.quantity += size
+            strategy.on_trade(signal, price, size, timestamp)
+        elif signal.action == "sell" and signal.size > 0:
+            size = min(signal.size, portfolio.quantity)
+            portfolio.cash += size * price
+            portfolio.quantity -= size
+            strategy.on_trade(signal, price, size, timestamp)
+
+    return signals
+
+
+@pytest.fixture
+def replay():
+    return _replay
@@ -0,0 +1,50 @@
+"""AsymmetricStrategy's running BTC EMAs and state persistence."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from strategy_interface import Portfolio
+from exchange_interface import MarketSnapshot
+from asymmetric_strategy import AsymmetricStrategy
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def reference_ema(prices, period):
+    """EMA over the whole series, seeded with the SMA of its first `period` prices."""
+    if len(prices) < period:
+        return None
+    ema = sum(prices[:period]) / period
+    multiplier = 2 / (period + 1)
+    for price in prices[period:]:
+        ema = (price * multiplier) + (ema * (1 - multiplier))
+    return ema
+
+
+def test_btc_emas_match_direct_recompute(btc_prices):
+    strategy = AsymmetricStrategy({}, None)
+    portfolio = Portfolio(symbol="BTC-USD", cash=10000.0)
+
+    for i, price in enumerate(btc_prices):
+        market = MarketSnapshot(symbol="BTC-USD", prices=btc_prices[:i + 1], current_price=price, timestamp=START)
+        strategy.generate_signal(market, portfolio)
+
+        seen = btc_prices[:i + 1]
+        for period, ema in ((strategy.btc_fast_ema, strategy._fast_ema),
+                            (strategy.btc_slow_ema, strategy._slow_ema)):
+            expected = reference_ema(seen, period)
+            if expected is None:
+                assert ema is None
+            else:
+                assert ema == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("prices_fixture", ["btc_prices", "eth_prices"])
+def test_state_round_trip_keeps_signals(request, replay, prices_fixture):
+    prices = request.getfixturevalue(prices_fixture)
+    uninterrupted = replay(lambda: AsymmetricStrategy({}, None), prices)
+
+    assert any(action != "hold" for action, _, _ in uninterrupted)
+    for split in (100, 700):
+        assert replay(lambda: AsymmetricStrategy({}, None), prices, split=split) == uninterrupted
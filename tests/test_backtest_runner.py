@@ -0,0 +1,95 @@
+"""Download retry classification in the backtest runner."""
+
+import pytest
+
+pytest.importorskip("yfinance")
+requests = pytest.importorskip("requests")
+
+import backtest_runner  # noqa: E402
+
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"HTTP {status_code}", response=response)
+
+
+@pytest.mark.parametrize("error", [
+    ConnectionError("connection reset"),
+    TimeoutError("timed out"),
+    requests.ConnectionError("connection refused"),
+    requests.Timeout("read timed out"),
+    http_error(503),
+    http_error(429),
+])
+def test_transient_errors_are_retried(error):
+    assert backtest_runner._is_transient(error)
+
+
+@pytest.mark.parametrize("error", [
+    ValueError("bad interval"),
+    KeyError("Close"),
+    http_error(404),
+    http_error(401),
+])
+def test_other_errors_fail_fast(error):
+    assert not backtest_runner._is_transient(error)
+
+
+class FakeTicker:
+    """Stands in for yf.Ticker, answering history() from a scripted list of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = outcomes
+        self.calls = 0
+
+    def __call__(self, symbol):
+        return self
+
+    def history(self, **kwargs):
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(backtest_runner.time, "sleep", lambda seconds: None)
+
+
+def test_download_retries_until_data_arrives(monkeypatch, no_sleep):
+    pd = pytest.importorskip("pandas")
+    data = pd.DataFrame({"Close": [1.0, 2.0]})
+    ticker = FakeTicker([http_error(503), pd.DataFrame(), data])
+    monkeypatch.setattr(backtest_runner.yf, "Ticker", ticker)
+
+    assert backtest_runner._download_with_retry("BTC-USD", "2024-01-01", "2024-01-02", "1h") is data
+    assert ticker.calls == 3
+
+
+def test_download_fails_fast_on_client_errors(monkeypatch, no_sleep):
+    ticker = FakeTicker([http_error(404)])
+    monkeypatch.setattr(backtest_runner.yf, "Ticker", ticker)
+
+    with pytest.raises(requests.HTTPError):
+        backtest_runner._download_with_retry("NOPE-USD", "2024-01-01", "2024-01-02", "1h")
+    assert ticker.calls == 1
+
+
+def test_unreadable_cache_file_is_replaced(monkeypatch, tmp_path):
+    pd = pytest.importorskip("pandas")
+    data = pd.DataFrame({"Close": [1.0, 2.0]})
+    monkeypatch.setattr(backtest_runner, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(backtest_runner, "_history_cache", {})
+    monkeypatch.setattr(backtest_runner, "_download_with_retry", lambda *args: data)
+
+    # A pickle cut short by an interrupted write
+    cache_path = tmp_path / "BTC-USD_2024-01-01_2024-01-02_1h.pkl"
+    data.to_pickle(cache_path)
+    cache_path.write_bytes(cache_path.read_bytes()[:20])
+
+    assert backtest_runner.load_history("BTC-USD", "2024-01-01", "2024-01-02") is data
+    pd.testing.assert_frame_equal(pd.read_pickle(cache_path), data)
+    assert [path.name for path in tmp_path.iterdir()] == [cache_path.name]
@@ -0,0 +1,45 @@
+"""DipBuyerCore's rolling high and peak tracking, and EthDipBuyer state persistence."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dip_buyer_core import DipBuyerCore
+from eth_dip_buyer import EthDipBuyer
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_core(lookback_hours, history_len):
+    return DipBuyerCore(dip_threshold=0.02, lookback_hours=lookback_hours, trailing_stop=0.15,
+                        cooldown_hours=12, position_pct=0.55, history_len=history_len,
+                        logger=logging.getLogger("test"))
+
+
+@pytest.mark.parametrize("lookback_hours, history_len", [(72, 200), (72, 50), (1, 200)])
+def test_recent_high_matches_window_max(eth_prices, lookback_hours, history_len):
+    core = make_core(lookback_hours, history_len)
+    timestamps = [START + timedelta(hours=i) for i in range(len(eth_prices))]
+
+    for i, (price, timestamp) in enumerate(zip(eth_prices, timestamps)):
+        core.track(price, timestamp)
+
+        cutoff = timestamp - timedelta(hours=lookback_hours)
+        first = max(i - history_len + 1, 0)
+        expected = max(eth_prices[j] for j in range(first, i + 1) if timestamps[j] >= cutoff)
+        assert core.recent_high(timestamp) == expected
+
+
+def test_track_peak():
+    assert DipBuyerCore.track_peak(100.0, None) == (100.0, 0.0)
+    assert DipBuyerCore.track_peak(110.0, 100.0) == (110.0, 0.0)
+    assert DipBuyerCore.track_peak(90.0, 120.0) == (120.0, pytest.approx(0.25))
+
+
+def test_state_round_trip_keeps_signals(replay, eth_prices):
+    uninterrupted = replay(lambda: EthDipBuyer({}, None), eth_prices)
+
+    assert any(action != "hold" for action, _, _ in uninterrupted)
+    for split in (100, 700):
+        assert replay(lambda: EthDipBuyer({}, None), eth_prices, split=split) == uninterrupted
@@ -0,0 +1,129 @@
+"""QuantumMomentumPro's incremental indicators against direct recomputes, and state persistence."""
+
+import statistics
+from datetime import datetime, timezone
+
+import pytest
+
+from strategy_interface import Portfolio
+from exchange_interface import MarketSnapshot
+from quantum_momentum_pro import QuantumMomentumProStrategy
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def ema_series(values, period):
+    """EMA of every prefix of `values`, seeded with the SMA of the first `period` (None before that)."""
+    multiplier = 2 / (period + 1)
+    series = []
+    ema = None
+    for i, value in enumerate(values):
+        if ema is not None:
+            ema = (value * multiplier) + (ema * (1 - multiplier))
+        elif i + 1 == period:
+            ema = sum(values[:period]) / period
+        series.append(ema)
+    return series
+
+
+def reference_rsi(prices, period):
+    """Wilder RSI over every price change seen so far."""
+    changes = [b - a for a, b in zip(prices, prices[1:])]
+    if len(changes) < period:
+        return None
+    avg_gain = sum(max(c, 0.0) for c in changes[:period]) / period
+    avg_loss = sum(max(-c, 0.0) for c in changes[:period]) / period
+    for change in changes[period:]:
+        avg_gain = (avg_gain * (period - 1) + max(change, 0.0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-change, 0.0)) / period
+    if avg_loss == 0:
+        return 100
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def feed(strategy, prices):
+    """Run every price through generate_signal without trading, yielding after each bar."""
+    portfolio = Portfolio(symbol="BTC-USD", cash=10000.0)
+    for i, price in enumerate(prices):
+        market = MarketSnapshot(symbol="BTC-USD", prices=prices[:i + 1], current_price=price, timestamp=START)
+        strategy.generate_signal(market, portfolio)
+        yield i
+
+
+def test_emas_match_direct_recompute(btc_prices):
+    strategy = QuantumMomentumProStrategy({}, None)
+    expected = {period: ema_series(btc_prices, period) for period in strategy._ema_periods}
+
+    for i in feed(strategy, btc_prices):
+        for period, series in expected.items():
+            if series[i] is None:
+                assert strategy._get_ema(period) is None
+            else:
+                assert strategy._get_ema(period) == pytest.approx(series[i], rel=1e-12)
+
+
+def test_macd_signal_line_matches_direct_recompute(btc_prices):
+    strategy = QuantumMomentumProStrategy({}, None)
+    fast = ema_series(btc_prices, strategy.macd_fast)
+    slow = ema_series(btc_prices, strategy.macd_slow)
+    macd_line = [f - s for f, s in zip(fast, slow) if f is not None and s is not None]
+    signal = ema_series(macd_line, strategy.macd_signal)
+    offset = len(btc_prices) - len(macd_line)
+
+    for i in feed(strategy, btc_prices):
+        macd = strategy._calculate_macd()
+        if i < offset or signal[i - offset] is None:
+            assert macd is None
+        else:
+            assert macd["macd"] == pytest.approx(macd_line[i - offset], rel=1e-9, abs=1e-9)
+            assert macd["signal"] == pytest.approx(signal[i - offset], rel=1e-9, abs=1e-9)
+
+
+def test_rsi_matches_direct_recompute(btc_prices):
+    strategy = QuantumMomentumProStrategy({}, None)
+
+    for i in feed(strategy, btc_prices):
+        expected = reference_rsi(btc_prices[:i + 1], strategy.rsi_period)
+        if expected is None:
+            assert strategy._calculate_rsi() is None
+        else:
+            assert strategy._calculate_rsi() == pytest.approx(expected, abs=1e-9)
+
+
+def test_bollinger_bands_match_direct_recompute(btc_prices):
+    strategy = QuantumMomentumProStrategy({}, None)
+    period = strategy.bb_period
+
+    for i in feed(strategy, btc_prices):
+        bands = strategy._calculate_bollinger_bands()
+        if i + 1 < period:
+            assert bands is None
+            continue
+        window = btc_prices[i + 1 - period:i + 1]
+        middle = statistics.fmean(window)
+        spread = strategy.bb_std * statistics.pstdev(window)
+        # Running sums of squares at BTC prices lose a few digits against a two-pass stdev
+        assert bands["middle"] == pytest.approx(middle, rel=1e-12)
+        assert bands["upper"] == pytest.approx(middle + spread, rel=1e-8)
+        assert bands["lower"] == pytest.approx(middle - spread, rel=1e-8)
+
+
+def test_atr_matches_direct_recompute(btc_prices):
+    strategy = QuantumMomentumProStrategy({}, None)
+    period = strategy.atr_period
+
+    for i in feed(strategy, btc_prices):
+        if i < period:
+            assert strategy._calculate_atr() is None
+            continue
+        window = btc_prices[i - period:i + 1]
+        expected = sum(abs(b - a) for a, b in zip(window, window[1:])) / period
+        assert strategy._calculate_atr() == pytest.approx(expected, rel=1e-9)
+
+
+def test_state_round_trip_keeps_signals(replay, btc_prices):
+    uninterrupted = replay(lambda: QuantumMomentumProStrategy({}, None), btc_prices)
+
+    assert any(action != "hold" for action, _, _ in uninterrupted)
+    for split in (100, 700):
+        assert replay(lambda: QuantumMomentumProStrategy({}, None), btc_prices, split=split) == uninterrupted
@@ -0,0 +1,69 @@
+"""SimpleTrendStrategy's running trend EMA against a direct recompute, and state persistence."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from strategy_interface import Portfolio
+from exchange_interface import MarketSnapshot
+from simple_trend_strategy import SimpleTrendStrategy
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def reference_ema(prices, period):
+    """EMA over the whole series, seeded with the SMA of its first `period` prices."""
+    if len(prices) < period:
+        return None
+    ema = sum(prices[:period]) / period
+    multiplier = 2 / (period + 1)
+    for price in prices[period:]:
+        ema = (price * multiplier) + (ema * (1 - multiplier))
+    return ema
+
+
+def feed(strategy, prices):
+    """Run every price through generate_signal without trading, yielding after each bar."""
+    portfolio = Portfolio(symbol="BTC-USD", cash=10000.0)
+    for i, price in enumerate(prices):
+        market = MarketSnapshot(symbol="BTC-USD", prices=prices[:i + 1], current_price=price, timestamp=START)
+        strategy.generate_signal(market, portfolio)
+        yield i
+
+
+def test_ema_matches_direct_recompute(btc_prices):
+    strategy = SimpleTrendStrategy({}, None)
+
+    for i in feed(strategy, btc_prices):
+        expected = reference_ema(btc_prices[:i + 1], strategy.trend_ema_period)
+        if expected is None:
+            assert strategy._ema is None
+        else:
+            assert strategy._ema == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("bars", [10, 500])
+def test_states_without_ema_are_replayed_from_history(btc_prices, bars):
+    strategy = SimpleTrendStrategy({}, None)
+    for _ in feed(strategy, btc_prices[:bars]):
+        pass
+
+    # States saved before the EMA was persisted carry the price history only
+    state = strategy.get_state()
+    del state["ema"], state["ema_seed_sum"], state["ema_seed_count"]
+    restored = SimpleTrendStrategy({}, None)
+    restored.set_state(state)
+
+    expected = reference_ema(state["price_history"], strategy.trend_ema_period)
+    if expected is None:
+        assert restored._ema is None
+    else:
+        assert restored._ema == pytest.approx(expected, rel=1e-12)
+
+
+def test_state_round_trip_keeps_signals(replay, btc_prices):
+    uninterrupted = replay(lambda: SimpleTrendStrategy({}, None), btc_prices)
+
+    assert any(action != "hold" for action, _, _ in uninterrupted)
+    for split in (100, 700):
+        assert replay(lambda: SimpleTrendStrategy({}, None), btc_prices, split=split) == uninterrupted
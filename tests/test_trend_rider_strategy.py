@@ -0,0 +1,97 @@
+"""TrendRiderStrategy's windowed EMAs and breakout high against direct recomputes, and state persistence."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from strategy_interface import Portfolio
+from exchange_interface import MarketSnapshot
+from trend_rider_strategy import TrendRiderStrategy
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def window_ema(window, period):
+    """EMA over `window`, seeded with the SMA of its first `period` prices."""
+    if len(window) < period:
+        return None
+    ema = sum(window[:period]) / period
+    multiplier = 2 / (period + 1)
+    for price in window[period:]:
+        ema = (price * multiplier) + (ema * (1 - multiplier))
+    return ema
+
+
+def feed(strategy, prices):
+    """Run every price through generate_signal without trading, yielding after each bar."""
+    portfolio = Portfolio(symbol="BTC-USD", cash=10000.0)
+    for i, price in enumerate(prices):
+        market = MarketSnapshot(symbol="BTC-USD", prices=prices[:i + 1], current_price=price, timestamp=START)
+        strategy.generate_signal(market, portfolio)
+        yield i
+
+
+def test_emas_match_window_recompute(btc_prices):
+    strategy = TrendRiderStrategy({}, None)
+    window_len = strategy.price_history.maxlen
+
+    for i in feed(strategy, btc_prices):
+        window = btc_prices[max(i + 1 - window_len, 0):i + 1]
+        for period in (strategy.fast_ema_period, strategy.slow_ema_period):
+            expected = window_ema(window, period)
+            if expected is None:
+                assert strategy._get_ema(period) is None
+            else:
+                assert strategy._get_ema(period) == pytest.approx(expected, rel=1e-12)
+
+
+def test_rebuild_matches_running_emas(btc_prices):
+    strategy = TrendRiderStrategy({}, None)
+    for _ in feed(strategy, btc_prices):
+        pass
+
+    # States saved before the EMA sums were persisted carry the price history only
+    state = strategy.get_state()
+    del state["ema_seed_sums"], state["ema_tails"]
+    restored = TrendRiderStrategy({}, None)
+    restored.set_state(state)
+
+    for period in (strategy.fast_ema_period, strategy.slow_ema_period):
+        assert restored._get_ema(period) == pytest.approx(strategy._get_ema(period), rel=1e-12)
+
+
+def test_breakout_high_matches_window_max(btc_prices):
+    strategy = TrendRiderStrategy({}, None)
+    period = strategy.breakout_period
+
+    for i in feed(strategy, btc_prices):
+        # Highest of the `period` bars before the current one
+        if i < period:
+            assert strategy._breakout_high is None
+        else:
+            assert strategy._breakout_high == max(btc_prices[i - period:i])
+
+
+def test_rebuilt_breakout_high_matches_running_one(btc_prices):
+    strategy = TrendRiderStrategy({}, None)
+    for _ in feed(strategy, btc_prices[:500]):
+        pass
+
+    restored = TrendRiderStrategy({}, None)
+    restored.set_state(strategy.get_state())
+    assert restored._breakout_high == strategy._breakout_high
+
+    # The restored window keeps sliding in step with the original
+    for i, price in enumerate(btc_prices[500:]):
+        market = MarketSnapshot(symbol="BTC-USD", prices=btc_prices[:501 + i], current_price=price, timestamp=START)
+        for running in (strategy, restored):
+            running.generate_signal(market, Portfolio(symbol="BTC-USD", cash=10000.0))
+        assert restored._breakout_high == strategy._breakout_high
+
+
+def test_state_round_trip_keeps_signals(replay, btc_prices):
+    uninterrupted = replay(lambda: TrendRiderStrategy({}, None), btc_prices)
+
+    assert any(action != "hold" for action, _, _ in uninterrupted)
+    for split in (100, 700):
+        assert replay(lambda: TrendRiderStrategy({}, None), btc_prices, split=split) == uninterrupted